@@ -0,0 +1,81 @@
+"""Compare nested box layouts of create_widget with the flat form layout of BaseDeviceWidget.flat_layout.
+Reports containers and layouts built and time to relayout when the window is resized.
+Run from the repository root with: python -m benchmarks.layout_benchmark --output layout.json"""
+
+import os
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from time import perf_counter
+import argparse
+import statistics
+import json
+import sys
+from qtpy.QtWidgets import QApplication, QWidget, QLayout
+from instrument_widgets.base_device_widget import BaseDeviceWidget, scan_for_properties
+from benchmarks.synthetic_devices import make_device_class
+from benchmarks.widget_benchmark import result, dispose
+
+PROPERTY_COUNTS = [200, 1000]
+SIZES = [(600, 800), (900, 1000)]  # window sizes alternated between to force relayout
+
+
+def widget_class(flat: bool, lazy: bool):
+    """Return BaseDeviceWidget subclass using given layout
+    :param flat: if properties are laid out as form rows
+    :param lazy: if nested dictionaries are built when expanded"""
+
+    return type('FlatWidget' if flat else 'NestedWidget', (BaseDeviceWidget,),
+                {'flat_layout': flat, 'lazy_nested_widgets': lazy})
+
+
+def measure_relayout(app, case: str, widget, resizes: int):
+    """Time from resizing window until pending layout and resize events are processed"""
+
+    widget.resize(*SIZES[0])
+    widget.show()
+    app.processEvents()
+    times = []
+    for i in range(resizes):
+        start = perf_counter()
+        widget.resize(*SIZES[(i + 1) % len(SIZES)])
+        app.processEvents()
+        times.append((perf_counter() - start) * 1000)
+    times.sort()
+    return [result('relayout_median', case, statistics.median(times), 'ms', 'lower'),
+            result('relayout_p95', case, times[int(len(times) * .95) - 1], 'ms', 'lower')]
+
+
+def measure_structure(case: str, widget):
+    """Count containers and layouts. Inputs and labels are the same in both layouts so only plain QWidgets differ"""
+
+    containers = [child for child in widget.findChildren(QWidget) if type(child) == QWidget]
+    return [result('containers', case, len(containers), 'widgets', 'lower'),
+            result('layouts', case, len(widget.findChildren(QLayout)), 'layouts', 'lower')]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--output', help='path of json file to write results to')
+    parser.add_argument('--resizes', type=int, default=50, help='number of times window is resized')
+    parser.add_argument('--expanded', action='store_true', help='build nested dictionaries up front instead of lazily')
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    results = []
+    for count in PROPERTY_COUNTS:
+        device_class = make_device_class(count)
+        properties = scan_for_properties(device_class())
+        for flat in [False, True]:
+            case = f"{'flat' if flat else 'nested'}[{count}]"
+            start = perf_counter()
+            widget = widget_class(flat, not args.expanded)(device_class, properties)
+            results.append(result('construction', case, (perf_counter() - start) * 1000, 'ms', 'lower'))
+            results += measure_structure(case, widget)
+            results += measure_relayout(app, case, widget, args.resizes)
+            dispose(app, [widget])
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+    for r in results:
+        print(f"{r['benchmark']:>16} {r['case']:>14}: {r['value']:.3f} {r['unit']}")
@@ -0,0 +1,81 @@
+"""Milliseconds per frame of rendering uint16 live frames to uint8 at 2k, 4k and 14k sensor widths.
+Compares the cached lookup table and subsampled auto contrast of FrameRenderer with scaling every pixel in floating
+point and taking percentiles of every pixel.
+Run from the repository root with: python -m benchmarks.render_benchmark --output render.json"""
+
+from time import perf_counter
+import argparse
+import statistics
+import json
+import numpy
+from instrument_widgets.device_services.frame_renderer import FrameRenderer
+
+WIDTHS = [2048, 4096, 14192]
+ASPECT = 10640 / 14192  # height to width of simulated VP-151MX sensor
+
+
+def make_frame(width: int):
+    """Synthetic uint16 frame with noise around a gradient so levels aren't trivial"""
+
+    height = int(width * ASPECT)
+    rng = numpy.random.default_rng(0)
+    gradient = numpy.linspace(1000, 30000, width, dtype=numpy.float32)
+    return (gradient + rng.normal(0, 500, (height, width)).astype(numpy.float32)).clip(0, 65535).astype(numpy.uint16)
+
+
+def result(benchmark: str, case: str, value: float, unit: str, better: str):
+    """Format single benchmark result like widget_benchmark without importing Qt"""
+
+    return {'benchmark': benchmark, 'case': case, 'value': value, 'unit': unit, 'better': better}
+
+
+def time_ms(function, repeat: int):
+    """Median milliseconds of calling function"""
+
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        times.append((perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def float_render(frame, low, high):
+    """Scale every pixel in floating point like rendering without a lookup table"""
+
+    return numpy.clip((frame.astype(numpy.float32) - low) * (255 / (high - low)), 0, 255).astype(numpy.uint8)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--output', help='path of json file to write results to')
+    parser.add_argument('--repeat', type=int, default=10, help='number of times each step is timed')
+    args = parser.parse_args()
+
+    results = []
+    for width in WIDTHS:
+        frame = make_frame(width)
+        case = f'{width}x{frame.shape[0]}'
+        renderer = FrameRenderer(contrast_interval_s=float('inf'))
+        renderer.render(frame)  # sets levels and builds table once
+        low, high = renderer.levels
+        results.append(result('lut_render', case, time_ms(lambda: renderer.render(frame), args.repeat),
+                              'ms/frame', 'lower'))
+        results.append(result('float_render', case, time_ms(lambda: float_render(frame, low, high), args.repeat),
+                              'ms/frame', 'lower'))
+        results.append(result('subsampled_auto_levels', case,
+                              time_ms(lambda: renderer.auto_levels(frame), args.repeat), 'ms', 'lower'))
+        results.append(result('full_percentile_levels', case,
+                              time_ms(lambda: numpy.percentile(frame, renderer.percentiles), args.repeat), 'ms',
+                              'lower'))
+
+    def rebuild():
+        renderer.levels = (renderer.levels[0] + 1, renderer.levels[1])
+        renderer.lut()
+    results.append(result('lut_rebuild', '65536 entries', time_ms(rebuild, args.repeat), 'ms', 'lower'))
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+    for r in results:
+        print(f"{r['benchmark']:>24} {r['case']:>14}: {r['value']:.3f} {r['unit']}")
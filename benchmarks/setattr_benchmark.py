@@ -0,0 +1,79 @@
+"""Compare the per-set cost of BaseDeviceWidget.__setattr__ before and after removing stack inspection.
+Run from the repository root with: python -m benchmarks.setattr_benchmark"""
+
+import os
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from inspect import currentframe
+from timeit import repeat
+import sys
+from qtpy.QtWidgets import QApplication
+from instrument_widgets.base_device_widget import BaseDeviceWidget
+
+
+class SyntheticStage:
+    """Minimal device with a flat and a nested property"""
+
+    def __init__(self):
+        self._position_mm = 0.0
+        self._limits_mm = {'x': 10.0, 'y': 10.0}
+
+    @property
+    def position_mm(self):
+        return self._position_mm
+
+    @position_mm.setter
+    def position_mm(self, value):
+        self._position_mm = value
+
+    @property
+    def limits_mm(self):
+        return self._limits_mm
+
+
+class FrameInspectionWidget(BaseDeviceWidget):
+    """BaseDeviceWidget using the previous stack inspecting __setattr__"""
+
+    def __setattr__(self, name, value):
+        self.__dict__[name] = value
+        if currentframe().f_back.f_locals.get('self', None) != self:  # call from outside so update widgets
+            self.ValueChangedOutside.emit(name)
+
+
+def time_sets(widget, name, number):
+    """Return average microseconds per outside set of attribute, taken from fastest of several runs
+    :param widget: widget to set attribute on
+    :param name: name of attribute
+    :param number: number of sets to average over"""
+
+    return min(repeat(lambda: setattr(widget, name, 1.0), number=number, repeat=5)) / number * 1e6
+
+
+def time_emits(widget, number):
+    """Return average microseconds per emit of ValueChangedOutside without receivers. Every outside set of a
+    registered property pays this
+    :param widget: widget to emit signal of
+    :param number: number of emits to average over"""
+
+    emit = widget.ValueChangedOutside.emit
+    return min(repeat(lambda: emit('position_mm'), number=number, repeat=5)) / number * 1e6
+
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    stage = SyntheticStage()
+    properties = {'position_mm': stage.position_mm, 'limits_mm': stage.limits_mm}
+    number = 100000
+
+    results = {}
+    for label, widget_class in {'frame inspection': FrameInspectionWidget, 'registry': BaseDeviceWidget}.items():
+        widget = widget_class(stage, properties)
+        widget.ValueChangedOutside[str].disconnect()  # measure set cost only, not widget repaint
+        results[label] = {name: time_sets(widget, name, number)
+                          for name in ['position_mm', 'limits_mm.x', 'unregistered_attribute']}
+        results[label]['signal emit only'] = time_emits(widget, number)
+
+    for label, times in results.items():
+        print(label)
+        for name, us in times.items():
+            print(f'    {name}: {us:.3f} us/set')
@@ -0,0 +1,158 @@
+"""Synthetic devices modeled on examples/resources/simulated_camera.py and simulated_laser.py. Module level
+variables below are found by the widgets' driver lookups the same way real driver constants are"""
+
+import numpy
+
+PIXEL_TYPES = {
+    "mono8": "uint8",
+    "mono16": "uint16"
+}
+FILTERS = {
+    'BP405': 0,
+    'BP488': 1,
+    'BP561': 2,
+    'LP638': 3,
+}
+AO_WAVEFORMS = ['square wave', 'sawtooth', 'triangle wave']
+DO_WAVEFORMS = ['square wave']
+SAMPLE_MODES = ['finite', 'continuous']
+
+
+def make_property(name: str):
+    """Create property with setter storing value in device's values dictionary
+    :param name: name of property"""
+
+    def getter(self):
+        return self.values[name]
+
+    def setter(self, value):
+        self.values[name] = value
+
+    return property(getter, setter, doc=f'{name} of synthetic device')
+
+
+def make_device_class(property_count: int, nested_every: int = 5):
+    """Create device class with given number of properties. Every nested_every property is a nested dictionary
+    :param property_count: number of properties
+    :param nested_every: how often a property is a dictionary instead of float"""
+
+    defaults = {}
+    for i in range(property_count):
+        if nested_every and i % nested_every == nested_every - 1:
+            defaults[f'property_{i}'] = {'x_um': 1.0, 'y_um': 2.0, 'limits': {'min_um': 0.0, 'max_um': 10.0}}
+        else:
+            defaults[f'property_{i}'] = float(i)
+
+    def __init__(self):
+        self.values = {k: v.copy() if type(v) == dict else v for k, v in defaults.items()}
+
+    namespace = {'__module__': __name__, '__init__': __init__}
+    for name in defaults:
+        namespace[name] = make_property(name)
+    return type(f'SyntheticDevice{property_count}', (), namespace)
+
+
+class SyntheticCamera:
+
+    def __init__(self, width_px: int = 2048, height_px: int = 2048, pixel_type: str = 'mono16'):
+        self.values = {'exposure_time_ms': 10.0,
+                       'pixel_type': pixel_type,
+                       'roi': {'width_px': width_px, 'height_px': height_px,
+                               'width_offset_px': 0, 'height_offset_px': 0}}
+        self.min_width_px = 64
+        self.max_width_px = 14192
+        self.step_width_px = 16
+        self.min_height_px = 2
+        self.max_height_px = 10640
+        self.step_height_px = 1
+        self.frame = 0
+
+    exposure_time_ms = make_property('exposure_time_ms')
+    pixel_type = make_property('pixel_type')
+    roi = make_property('roi')
+
+    @property
+    def line_interval_us(self):
+        return 10.0
+
+    @property
+    def sensor_width_px(self):
+        return 14192
+
+    @property
+    def sensor_height_px(self):
+        return 10640
+
+    def grab_frame(self):
+        """Return synthetic frame of current roi and pixel type"""
+
+        self.frame += 1
+        shape = (self.values['roi']['height_px'], self.values['roi']['width_px'])
+        dtype = PIXEL_TYPES[self.values['pixel_type']]
+        return numpy.random.default_rng(self.frame).integers(0, numpy.iinfo(dtype).max, shape, dtype=dtype)
+
+
+class SyntheticLaser:
+
+    def __init__(self):
+        self.values = {'power_setpoint_mw': 10.0, 'modulation_mode': 'off'}
+        self.max_power_mw = 100.0
+
+    power_setpoint_mw = make_property('power_setpoint_mw')
+    modulation_mode = make_property('modulation_mode')
+
+    @property
+    def power_mw(self):
+        return self.values['power_setpoint_mw']
+
+    @property
+    def temperature_c(self):
+        return 25.0
+
+
+class SyntheticFilterWheel:
+
+    def __init__(self):
+        self.values = {'filter': 'BP405'}
+        self.filters = FILTERS
+
+    filter = make_property('filter')
+
+
+class SyntheticDAQ:
+
+    def __init__(self, port_count: int = 3, channels: list = ['488', '561', '639']):
+        """
+        :param port_count: number of analog ports in ao task
+        :param channels: wavelengths of each port's parameters"""
+
+        self.id = 'Dev1'
+        self.ao_physical_chans = [f'Dev1/ao{i}' for i in range(max(port_count, 8))]
+        self.co_physical_chans = ['Dev1/ctr0', 'Dev1/ctr1']
+        self.do_physical_chans = [f'Dev1/port0/line{i}' for i in range(8)]
+        self.dio_ports = ['PFI0', 'PFI1']
+        self.min_ao_volts = -5.0
+        self.max_ao_volts = 5.0
+
+        ports = {}
+        for i in range(port_count):
+            ports[f'port {i}'] = {
+                'port': f'ao{i}',
+                'device_min_volts': 0.0,
+                'device_max_volts': 5.0,
+                'waveform': 'sawtooth',
+                'parameters': {
+                    'start_time_ms': {'channels': {wl: 10.0 for wl in channels}},
+                    'end_time_ms': {'channels': {wl: 400.0 for wl in channels}},
+                    'amplitude_volts': {'channels': {wl: 1.0 for wl in channels}},
+                    'offset_volts': {'channels': {wl: 2.5 for wl in channels}},
+                    'cutoff_frequency_hz': {'channels': {wl: 200 for wl in channels}},
+                }
+            }
+        self.tasks = {'ao_task': {'name': 'ao task',
+                                  'timing': {'trigger_port': 'PFI0',
+                                             'sample_mode': 'finite',
+                                             'period_time_ms': 500,
+                                             'rest_time_ms': 50,
+                                             'sampling_frequency_hz': 10000},
+                                  'ports': ports}}
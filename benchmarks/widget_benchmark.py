@@ -0,0 +1,232 @@
+"""Headless benchmarks of device widget construction time, outside update throughput, inside edit latency and memory.
+Run from the repository root with: python -m benchmarks.widget_benchmark --output results.json
+Pass --baseline with a previous results file to exit with an error if any result regressed beyond --tolerance"""
+
+import os
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from time import perf_counter
+import argparse
+import platform
+import statistics
+import tracemalloc
+import json
+import gc
+import sys
+import enum
+from qtpy.QtCore import QObject
+from qtpy.QtWidgets import QApplication, QComboBox
+from instrument_widgets.base_device_widget import BaseDeviceWidget, scan_for_properties
+from instrument_widgets.device_widgets.camera_widget import CameraWidget
+from instrument_widgets.device_widgets.laser_widget import LaserWidget
+from instrument_widgets.device_widgets.filter_wheel_widget import FilterWheelWidget
+from instrument_widgets.device_widgets.ni_widget import NIWidget
+from benchmarks.synthetic_devices import make_device_class, SyntheticCamera, SyntheticLaser, SyntheticFilterWheel, \
+    SyntheticDAQ
+
+PROPERTY_COUNTS = [10, 50, 200, 1000]
+NI_PORT_COUNTS = [1, 4, 16]
+
+
+def base_widget_factory(property_count: int):
+    """Return factory building BaseDeviceWidget for synthetic device with property_count properties"""
+
+    device_class = make_device_class(property_count)
+    device = device_class()
+    return lambda: BaseDeviceWidget(device_class, scan_for_properties(device))
+
+
+def widget_factories():
+    """Return dictionary of benchmark case names mapping to functions building a widget"""
+
+    factories = {f'BaseDeviceWidget[{n}]': base_widget_factory(n) for n in PROPERTY_COUNTS}
+    factories['CameraWidget'] = lambda: CameraWidget(SyntheticCamera())
+    factories['LaserWidget'] = lambda: LaserWidget(SyntheticLaser())
+    factories['FilterWheelWidget'] = lambda: FilterWheelWidget(SyntheticFilterWheel())
+    for n in NI_PORT_COUNTS:
+        factories[f'NIWidget[{n}]'] = lambda port_count=n: NIWidget(SyntheticDAQ(port_count))
+    return factories
+
+
+def result(benchmark: str, case: str, value: float, unit: str, better: str):
+    """Format single benchmark result"""
+
+    return {'benchmark': benchmark, 'case': case, 'value': value, 'unit': unit, 'better': better}
+
+
+def dispose(app, widgets: list):
+    """Delete widgets and let Qt free them"""
+
+    for widget in widgets:
+        widget.deleteLater()
+    widgets.clear()
+    app.processEvents()
+    gc.collect()
+
+
+def measure_construction(app, case: str, factory, repeat: int):
+    """Time building widget. Reports median since first build also fills class level caches"""
+
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        widget = factory()
+        times.append((perf_counter() - start) * 1000)
+        dispose(app, [widget])
+    return [result('construction', case, statistics.median(times), 'ms', 'lower'),
+            result('construction_first', case, times[0], 'ms', 'lower')]
+
+
+def leaf_names(widget):
+    """Return names of all properties that have a built input widget"""
+
+    return [name for name in widget._property_names if f'{name}_widget' in widget.__dict__]
+
+
+def sample_values(widget, name: str):
+    """Return values of property's own type to cycle through, so updates exercise the widget instead of the error
+    path of a value it can't show. Combo boxes cycle their options and numbers stay within their validator"""
+
+    value = getattr(widget, name)
+    box = getattr(widget, f'{name}_widget')
+    if isinstance(value, enum.Enum):
+        return list(type(value))
+    if isinstance(box, QComboBox):
+        options = [box.itemText(i) for i in range(box.count())]
+        return [type(value)(option) for option in options] if isinstance(value, (int, float)) else options
+    if isinstance(value, bool):
+        return [value, not value]
+    if isinstance(value, (int, float)):
+        top = getattr(box.validator(), 'top', lambda: None)() if box.validator() is not None else None
+        other = value - 1 if top is not None and value + 1 > top else value + 1
+        return [value, type(value)(other)]
+    return [value, f'{value}_']
+
+
+def measure_outside_updates(app, case: str, factory, count: int):
+    """Rate of device updates handled. Burst of 1 flushes after every update, larger bursts measure coalescing"""
+
+    widget = factory()
+    names = leaf_names(widget)
+    values = {name: sample_values(widget, name) for name in names}
+    results = []
+    for burst in [1, 100]:
+        start = perf_counter()
+        for i in range(count):
+            name = names[i % len(names)]
+            widget.set_from_device(name, values[name][(i // len(names)) % len(values[name])])
+            if i % burst == burst - 1:
+                widget.flush_property_updates()
+        widget.flush_property_updates()
+        results.append(result(f'outside_updates_burst_{burst}', case, count / (perf_counter() - start),
+                              'updates/s', 'higher'))
+    dispose(app, [widget])
+    return results
+
+
+def measure_inside_latency(app, case: str, factory, count: int):
+    """Time from text box edit finishing until ValueChangedInside is received"""
+
+    widget = factory()
+    names = [name for name in leaf_names(widget) if type(getattr(widget, name)) == float]
+    if not names:
+        dispose(app, [widget])
+        return []
+    values = {name: sample_values(widget, name) for name in names}
+    received = []
+    widget.ValueChangedInside[str].connect(lambda name: received.append(perf_counter()))
+    latencies = []
+    for i in range(count):
+        name = names[i % len(names)]
+        textbox = getattr(widget, f'{name}_widget')
+        textbox.setText(str(values[name][(i // len(names)) % len(values[name])]))
+        start = perf_counter()
+        textbox.editingFinished.emit()
+        latencies.append((received[-1] - start) * 1e6)
+    dispose(app, [widget])
+    latencies.sort()
+    return [result('inside_latency_median', case, statistics.median(latencies), 'us', 'lower'),
+            result('inside_latency_p95', case, latencies[int(len(latencies) * .95) - 1], 'us', 'lower')]
+
+
+def rss_bytes():
+    """Resident memory of process read from /proc. Returns None on platforms without it"""
+
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def measure_memory(app, case: str, factory, count: int):
+    """Python heap, resident memory and Qt objects per widget averaged over count widgets"""
+
+    factory()  # warm caches so they aren't counted against widgets
+    app.processEvents()
+    gc.collect()
+    rss_start = rss_bytes()
+    tracemalloc.start()
+    snapshot_start = tracemalloc.take_snapshot()
+    widgets = [factory() for _ in range(count)]
+    snapshot_end = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    rss_end = rss_bytes()
+    python_bytes = sum(stat.size_diff for stat in snapshot_end.compare_to(snapshot_start, 'filename'))
+    qt_objects = statistics.mean(len(widget.findChildren(QObject)) for widget in widgets)
+    dispose(app, widgets)
+    results = [result('python_heap_per_widget', case, python_bytes / count, 'bytes', 'lower'),
+               result('qt_objects_per_widget', case, qt_objects, 'objects', 'lower')]
+    if rss_start is not None:
+        results.append(result('rss_per_widget', case, (rss_end - rss_start) / count, 'bytes', 'lower'))
+    return results
+
+
+def compare(results: list, baseline: list, tolerance: float):
+    """Return results worse than baseline by more than tolerance fraction"""
+
+    previous = {(r['benchmark'], r['case']): r['value'] for r in baseline}
+    regressions = []
+    for r in results:
+        if (old := previous.get((r['benchmark'], r['case']))) is None or old == 0:
+            continue
+        change = (r['value'] - old) / abs(old) if r['better'] == 'lower' else (old - r['value']) / abs(old)
+        if change > tolerance:
+            regressions.append({**r, 'baseline': old, 'regression': change})
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--output', help='path of json file to write results to')
+    parser.add_argument('--baseline', help='path of previous results to compare against')
+    parser.add_argument('--tolerance', type=float, default=.2, help='allowed fraction a result can get worse by')
+    parser.add_argument('--repeat', type=int, default=5, help='number of times each widget is built')
+    parser.add_argument('--updates', type=int, default=2000, help='number of outside updates sent')
+    parser.add_argument('--edits', type=int, default=500, help='number of inside edits made')
+    parser.add_argument('--memory-widgets', type=int, default=5, help='number of widgets built to measure memory')
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    results = []
+    for case, factory in widget_factories().items():
+        results += measure_construction(app, case, factory, args.repeat)
+        results += measure_outside_updates(app, case, factory, args.updates)
+        results += measure_inside_latency(app, case, factory, args.edits)
+        results += measure_memory(app, case, factory, args.memory_widgets)
+
+    report = {'python': platform.python_version(), 'platform': platform.platform(),
+              'qt_platform': os.environ['QT_QPA_PLATFORM'], 'results': results}
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file)['results'], args.tolerance)
+        for r in regressions:
+            print(f"regression: {r['benchmark']} {r['case']} {r['baseline']:.3g} -> {r['value']:.3g} {r['unit']}",
+                  file=sys.stderr)
+        sys.exit(1 if regressions else 0)
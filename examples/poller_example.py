@@ -0,0 +1,26 @@
+from examples.resources.simulated_camera import Camera
+from instrument_widgets.device_widgets.camera_widget import CameraWidget
+from instrument_widgets.device_services.property_poller import PropertyPoller
+from instrument_widgets.device_services.command_queue import DeviceCommandQueue
+from qtpy.QtWidgets import QApplication
+import sys
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    camera_object = Camera('camera')
+    camera = CameraWidget(camera_object)
+    camera.show()
+
+    # read back properties in the background instead of calling getattr on the device after each change
+    poller = PropertyPoller()
+    poller.add_device(camera_object, {'exposure_time_ms': 5, 'roi': 2, 'pixel_type': 1}, widget=camera)
+    poller.start()
+    app.aboutToQuit.connect(poller.stop)
+
+    # apply edits on a worker thread so slider drags and scrolling don't block the gui
+    commands = DeviceCommandQueue(camera_object)
+    commands.connect_widget(camera)
+    commands.queueDepthChanged[int].connect(lambda depth: print('queued writes:', depth))
+    app.aboutToQuit.connect(commands.stop)
+
+    sys.exit(app.exec_())
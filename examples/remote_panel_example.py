@@ -0,0 +1,20 @@
+from examples.resources.simulated_camera import Camera
+from instrument_widgets.device_services.remote_panel import DeviceAgent
+import tempfile
+import time
+import os
+
+if __name__ == "__main__":
+    # device process keeps running its loop while panel runs in its own process and event loop
+    camera_object = Camera('camera')
+    address = os.path.join(tempfile.mkdtemp(), 'camera.sock')
+    agent = DeviceAgent(camera_object, address, rates={'exposure_time_ms': 5, 'roi': 2, 'pixel_type': 1})
+    agent.start()
+    panel = agent.launch_panel()
+
+    try:
+        while panel.poll() is None:  # stand in for acquisition loop
+            print('exposure time:', camera_object.exposure_time_ms, 'messages sent:', agent.messages_sent)
+            time.sleep(1)
+    finally:
+        agent.stop()
@@ -2,7 +2,7 @@ import logging
 import numpy
 import time
 from multiprocessing import Process
-from threading import Thread
+from threading import Thread, Event
 
 # constants for VP-151MX camera
 BUFFER_SIZE_FRAMES = 8
@@ -140,12 +140,17 @@ class Camera:
 
     def start(self, frame_count: int, live: bool = False):
         self.log.info('simulated camera starting...')
+        self.stop_event = Event()
+        self.frame = 0
+        self.dropped_frames = 0
+        self.frame_rate = 0
         self.thread = Thread(target=self.generate_frames, args=(frame_count,))
         self.thread.daemon = True
         self.thread.start()
 
     def stop(self):
         self.log.info('simulated camera stopping...')
+        self.stop_event.set()
         self.thread.join()
 
     def grab_frame(self):
@@ -165,7 +170,7 @@ class Camera:
         state['out_buffer_size'] = BUFFER_SIZE_FRAMES - len(self.buffer)
          # number of underrun, i.e. dropped frames
         state['dropped_frames'] = self.dropped_frames
-        state['data_rate'] = self.frame_rate*self.simulated_width_px*self.simulated_height_px*numpy.dtype(self.simulated_pixel_type).itemsize/1e6
+        state['data_rate'] = self.frame_rate*self.simulated_width_px*self.simulated_height_px*numpy.dtype(PIXEL_TYPES[self.simulated_pixel_type]).itemsize/1e6
         state['frame_rate'] = self.frame_rate
         self.log.info(f"id: {self.id}, "
                       f"frame: {state['frame_index']}, "
@@ -174,17 +179,16 @@ class Camera:
                       f"dropped: {state['dropped_frames']}, "
                       f"data rate: {state['data_rate']:.2f} [MB/s], "
                       f"frame rate: {state['frame_rate']:.2f} [fps].")
+        return state
 
     def generate_frames(self, frame_count: int):
-        self.frame = 0
-        self.dropped_frames = 0
-        while self.frame < frame_count:
+        while self.frame < frame_count and not self.stop_event.is_set():
             start_time = time.time()
             column_count = self.simulated_width_px
             row_count = self.simulated_height_px
             frame_time_s = (row_count*self.simulated_line_interval_us/1000+self.simulated_exposure_time_ms)/1000
             # image = numpy.random.randint(low=128, high=256, size=(row_count, column_count), dtype=self.simulated_pixel_type)
-            image = numpy.zeros(shape=(row_count, column_count), dtype=self.simulated_pixel_type)
+            image = numpy.zeros(shape=(row_count, column_count), dtype=PIXEL_TYPES[self.simulated_pixel_type])
             while (time.time() - start_time) < frame_time_s:
                 time.sleep(0.01)
             if len(self.buffer) < BUFFER_SIZE_FRAMES:
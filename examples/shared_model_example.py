@@ -0,0 +1,26 @@
+from examples.resources.simulated_camera import Camera
+from instrument_widgets.device_widgets.camera_widget import CameraWidget
+from instrument_widgets.device_services.device_property_model import get_property_model
+from instrument_widgets.device_services.property_poller import PropertyPoller
+from qtpy.QtWidgets import QApplication
+import sys
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    camera_object = Camera('camera')
+
+    # create model before views so they are built from its values instead of each reading the camera
+    model = get_property_model(camera_object)
+    views = [CameraWidget(camera_object) for _ in range(2)]
+    for view in views:
+        model.attach(view)
+        view.show()
+
+    # one poll feeds both views
+    poller = PropertyPoller()
+    model.poll(poller, {'exposure_time_ms': 5, 'roi': 2})
+    poller.start()
+    app.aboutToQuit.connect(poller.stop)
+    app.aboutToQuit.connect(model.commands.stop)
+
+    sys.exit(app.exec_())
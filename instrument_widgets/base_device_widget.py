@@ -1,21 +1,44 @@
-from qtpy.QtCore import Signal, Slot, QTimer
+from qtpy.QtCore import Signal, Slot, QTimer, Qt
 from qtpy.QtGui import QIntValidator, QDoubleValidator
-from qtpy.QtWidgets import QWidget, QLineEdit, QLabel, QComboBox, QHBoxLayout, QVBoxLayout, QMainWindow, QGridLayout
-from inspect import currentframe
-import importlib
+from qtpy.QtWidgets import QWidget, QLineEdit, QLabel, QComboBox, QHBoxLayout, QVBoxLayout, QMainWindow, QGridLayout, \
+    QFormLayout, QTreeView, QAbstractItemView
 import enum
 import types
 import ruamel.yaml
-import re
 import logging
-import inflection
+from concurrent.futures import Future, wait
+from threading import Thread, Condition
+from time import monotonic
 from instrument_widgets.miscellaneous_widgets.q_scrollable_line_edit import QScrollableLineEdit
+from instrument_widgets.miscellaneous_widgets.q_lazy_collapsible_widget import QLazyCollapsibleWidget
+from instrument_widgets.miscellaneous_widgets.q_sparkline import QSparkline
+from instrument_widgets.miscellaneous_widgets.q_property_tree_model import QPropertyTreeModel, QPropertyItemDelegate
+from instrument_widgets.device_schema import get_device_schema
+from instrument_widgets.session_snapshot import take_restored_properties
+from instrument_widgets.device_services.device_property_model import find_property_model
+from instrument_widgets.device_services.device_locks import get_device_lock
+from instrument_widgets.device_services.device_registry import DeviceRegistry
+from instrument_widgets.widget_profiler import profiled
 #TODO deal with lists somehow. Some way to add maybe if setter?
 
+_scans = DeviceRegistry()  # PropertyScans of devices started ahead of their widget
+
 class BaseDeviceWidget(QMainWindow):
     ValueChangedOutside = Signal((str,))
     ValueChangedInside = Signal((str,))
-
+    PendingPropertyArrived = Signal(str, object)
+    scan_timeout_s = None  # if set, subclasses read device properties in background and wait this long per getter
+    _property_names = frozenset()  # registry of property attributes. Replaced per instance in __init__
+    update_interval_ms = 16  # coalesce outside changes and flush once per display frame
+    lazy_nested_widgets = False  # if set, build widgets of nested dictionaries when first expanded or accessed
+    property_backend = 'widgets'  # 'model' shows properties in a tree view with editors only for the edited row
+    flat_layout = False  # lay out properties as rows of one form per group instead of nested box layouts
+    wheel_commit_delay_ms = None  # if set, scrolled numeric values are committed once scrolling settles
+    wheel_max_commit_rate_hz = None  # if set with delay, also commit while scrolling at most this often
+    telemetry_sample_hz = None  # if set, read only numeric properties show a sparkline of values sampled at this rate
+    telemetry_history = 120  # number of samples shown in sparklines
+
+    @profiled('construction', count_objects=True)
     def __init__(self, device_object, properties: dict):
         """Base widget for devices like camera, laser, stage, ect. Widget will scan properties of
         device object and create editable inputs for each if not in device_widgets class of device. If no device_widgets
@@ -26,15 +49,45 @@ class BaseDeviceWidget(QMainWindow):
         self.log = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
         super().__init__()
+        # connected before widgets are built so getters finishing during construction aren't missed. Queued so
+        # placeholder is in layout before it is replaced
+        self.PendingPropertyArrived.connect(self.fill_pending_property, Qt.ConnectionType.QueuedConnection)
+        self._emit_outside = self.ValueChangedOutside.emit  # bound once since every outside set emits
+        self._property_names = set()
+        self._accessors = {}  # dotted property names mapping to (container, key) of value in nested dictionary
+        self._lazy_groups = {}
+        self._rendered_text = {}  # names of input widgets mapping to text they last showed
+        self.skipped_widget_writes = 0  # outside updates whose widget already showed the value
+        self._telemetry = {}  # property names mapping to sparklines
+        self._telemetry_timer = None
+        self._telemetry_queue = None  # poll queue reading telemetry properties from device
         self.device_object = device_object
-        self.device_driver = importlib.import_module(self.device_object.__module__) if type(self.device_object) != dict \
-            else types.SimpleNamespace()  # dummy driver if object is dictionary
-        self.create_property_widgets(properties, 'property')
-
-        widget = create_widget('V', **self.property_widgets)
+        if type(self.device_object) != dict:
+            # schema is shared by all widgets of device class so introspection only happens once
+            self.device_schema = get_device_schema(device_object if isinstance(device_object, type)
+                                                   else type(device_object))
+            self.device_driver = self.device_schema.driver
+        else:
+            self.device_schema = None
+            self.device_driver = types.SimpleNamespace()  # dummy driver if object is dictionary
+        if self.property_backend == 'model':
+            widget = self.create_property_view(properties)
+        elif self.flat_layout:
+            widget = self.create_property_form(properties, 'property')
+        else:
+            self.create_property_widgets(properties, 'property')
+            widget = create_widget('V', **self.property_widgets)
         self.setCentralWidget(widget)
-        self.ValueChangedOutside[str].connect(self.update_property_widget)  # Trigger update when property value changes
 
+        # Trigger update when property value changes. Changes are gathered and flushed on the next timer tick
+        self._dirty_properties = {}
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(self.update_interval_ms)
+        self._update_timer.timeout.connect(self.flush_property_updates)
+        self.ValueChangedOutside[str].connect(self.schedule_property_update)
+
+    @profiled('create_property_widgets')
     def create_property_widgets(self, properties: dict, widget_group):
         """Create input widgets based on properties
          :param properties: dictionary containing properties within a class and mapping to values
@@ -42,25 +95,22 @@ class BaseDeviceWidget(QMainWindow):
 
         widgets = {}
         for name, value in properties.items():
-            setattr(self, name, value)  # Add device properties as widget properties
+            if isinstance(value, PendingProperty):
+                widgets[name] = self.create_pending_widget(name, value)
+                continue
+            self._register_property(name, value)  # Add device properties as widget properties
             input_widgets = {'label': QLabel(label_maker(name.split('.')[-1]))}
             arg_type = type(value)
-            search_name = arg_type.__name__ if arg_type.__name__ in dir(self.device_driver) else name
-
-            # Create combo boxes if there are preset options
-            if input_specs := self.check_driver_variables(search_name):
-                widget_type = 'combo'
-            # If no found options, create an editable text box
-            else:
-                input_specs = value
-                widget_type = 'text'
+            widget_type, input_specs = self.find_input_specs(name, value)
             boxes = {}
             if arg_type not in [dict, ruamel.yaml.comments.CommentedMap] or type(arg_type) == enum.EnumMeta:
                 boxes[name] = self.create_attribute_widget(name, widget_type, input_specs)
             elif arg_type in [dict, ruamel.yaml.comments.CommentedMap]:
                 for k, v in input_specs.items():
-                    # create attribute
-                    setattr(self, f"{name}.{k}", getattr(self, name)[k])
+                    if type(v) in [dict, ruamel.yaml.comments.CommentedMap] and widget_type != 'combo' \
+                            and self.lazy_nested_widgets:  # collapsible group labels itself
+                        boxes[k] = self.create_lazy_group(f'{name}.{k}', label_maker(k))
+                        continue
                     label = QLabel(label_maker(k))
                     if type(v) in [dict,
                                    ruamel.yaml.comments.CommentedMap] and widget_type != 'combo':  # values are complex and should be another widget
@@ -72,15 +122,294 @@ class BaseDeviceWidget(QMainWindow):
             input_widgets = {**input_widgets, 'widget': create_widget('H', **boxes)}
             widgets[name] = create_widget(struct='H', **input_widgets)
 
-            if attr := getattr(self.device_object, name, False):  # if name is attribute of device
-                widgets[name].setToolTip(attr.__doc__)  # Set tooltip to properties docstring
-                if not getattr(attr, 'fset', False):  # Constant, unchangeable attribute
+            if (info := self.device_property_info(name)) is not None:  # if name is attribute of device
+                docstring, settable = info
+                widgets[name].setToolTip(docstring)  # Set tooltip to properties docstring
+                if not settable:  # Constant, unchangeable attribute
                     widgets[name].setDisabled(True)
+                    if self.is_telemetry(value):
+                        widgets[name].layout().addWidget(self.create_telemetry(name))
 
         # Add attribute of grouped widgets for easy access
         setattr(self, f'{widget_group}_widgets', widgets)
         return widgets
 
+    @profiled('create_property_form')
+    def create_property_form(self, properties: dict, widget_group):
+        """Create form with a row of label and input for each property. Only nested dictionaries get a container
+        widget so there are far fewer layouts to resize than with create_property_widgets
+        :param properties: dictionary containing properties within a class and mapping to values
+        :param widget_group: attribute name for dictionary of input widgets"""
+
+        widgets = {}
+        layout = QFormLayout()
+        for name, value in properties.items():
+            if isinstance(value, PendingProperty):
+                widgets[name] = self.create_pending_widget(name, value)
+                layout.addRow(widgets[name])
+                continue
+            label, widgets[name] = self.create_form_row(name, value)
+            layout.addRow(label, widgets[name])
+        layout.setContentsMargins(0, 0, 0, 0)
+        form = QWidget()
+        form.setLayout(layout)
+
+        # Add attribute of grouped widgets for easy access
+        setattr(self, f'{widget_group}_widgets', widgets)
+        return form
+
+    def create_form_row(self, name, value):
+        """Create label and input of property. Keys of dictionary properties are rows of a nested form
+        :param name: name of property
+        :param value: value of property
+        :return: label and input widget of row"""
+
+        self._register_property(name, value)  # Add device properties as widget properties
+        label = QLabel(label_maker(name.split('.')[-1]))
+        widget_type, input_specs = self.find_input_specs(name, value)
+        if type(value) not in [dict, ruamel.yaml.comments.CommentedMap]:
+            field = self.create_attribute_widget(name, widget_type, input_specs)
+        else:
+            layout = QFormLayout()
+            for k, v in input_specs.items():
+                if type(v) in [dict, ruamel.yaml.comments.CommentedMap] and widget_type != 'combo':
+                    if self.lazy_nested_widgets:  # collapsible group labels itself
+                        layout.addRow(self.create_lazy_group(f'{name}.{k}', label_maker(k)))
+                    else:
+                        layout.addRow(QLabel(label_maker(k)), self.create_property_form(
+                            {f'{name}.{k}.{kv}': vv for kv, vv in v.items()}, f'{name}.{k}'))
+                else:
+                    layout.addRow(QLabel(label_maker(k)), self.create_attribute_widget(f'{name}.{k}', widget_type, v))
+            layout.setContentsMargins(0, 0, 0, 0)
+            field = QWidget()
+            field.setLayout(layout)
+
+        if (info := self.device_property_info(name)) is not None:  # if name is attribute of device
+            docstring, settable = info
+            if not settable and self.is_telemetry(value):
+                field = create_widget('H', field, self.create_telemetry(name))
+            label.setToolTip(docstring)  # Set tooltip to properties docstring
+            field.setToolTip(docstring)
+            if not settable:  # Constant, unchangeable attribute
+                label.setDisabled(True)
+                field.setDisabled(True)
+        return label, field
+
+    def is_telemetry(self, value):
+        """If read only property with value gets a sparkline
+        :param value: value of property"""
+
+        return self.telemetry_sample_hz is not None and type(value) in [int, float]
+
+    def create_telemetry(self, name):
+        """Create sparkline of property's recent values. Values are sampled from the widget's attribute, which
+        poll_telemetry keeps reading from the device
+        :param name: name of numeric property"""
+
+        sparkline = QSparkline(self.telemetry_history)
+        sparkline.append(getattr(self, name))
+        self._telemetry[name] = sparkline
+        setattr(self, f'{name}_sparkline', sparkline)
+        if self._telemetry_queue is not None:  # property arrived after polling started
+            self._telemetry_queue.set_rate(name, self.telemetry_sample_hz)
+        if self._telemetry_timer is None:  # one timer samples all sparklines of widget
+            self._telemetry_timer = QTimer(self)
+            self._telemetry_timer.timeout.connect(self.sample_telemetry)
+            self._telemetry_timer.start(int(1000 / self.telemetry_sample_hz))
+        return sparkline
+
+    def poll_telemetry(self, poller, device):
+        """Read telemetry properties from device at telemetry_sample_hz so sparklines follow the device. Without it,
+        sparklines only change when set_from_device is called
+        :param poller: PropertyPoller to read device with
+        :param device: device object shown by widget
+        :return: poll queue of device"""
+
+        if (queue := poller.queues.get(id(device))) is None:
+            queue = poller.add_device(device, {})
+        queue.valueChanged.connect(self.set_from_device)  # queued since emitted by poller thread
+        for name in self._telemetry:
+            queue.set_rate(name, self.telemetry_sample_hz)
+        self._telemetry_queue = queue
+        return queue
+
+    @Slot()
+    def sample_telemetry(self):
+        """Append current value of each telemetry property to its sparkline"""
+
+        for name, sparkline in self._telemetry.items():
+            sparkline.append(getattr(self, name))
+
+    def create_property_view(self, properties: dict):
+        """Create tree view of properties backed by a single item model instead of widgets for every property
+        :param properties: dictionary containing properties within a class and mapping to values"""
+
+        self.property_widgets = {}
+        names = []
+        for name, value in properties.items():
+            if isinstance(value, PendingProperty):  # added to model once read
+                value.future.add_done_callback(lambda future, n=name: self.PendingPropertyArrived.emit(n, future))
+                continue
+            self._register_property(name, value)
+            names.append(name)
+        self.property_model = QPropertyTreeModel(self, names)
+        self.property_view = QTreeView()
+        self.property_view.setModel(self.property_model)
+        self.property_view.setItemDelegate(QPropertyItemDelegate(self.property_view))
+        self.property_view.setEditTriggers(QAbstractItemView.EditTrigger.AllEditTriggers)
+        self.property_view.setUniformRowHeights(True)  # lets view skip measuring rows that aren't visible
+        return self.property_view
+
+    def find_input_specs(self, name, value):
+        """Find type of input for property and what it is built from
+        :param name: name of property
+        :param value: value of property
+        :return: 'combo' and options if preset options are found in driver, otherwise 'text' and value"""
+
+        arg_type = type(value)
+        search_name = arg_type.__name__ if arg_type.__name__ in vars(self.device_driver) else name
+
+        # Create combo boxes if there are preset options
+        if input_specs := self.check_driver_variables(search_name):
+            return 'combo', input_specs
+        # If no found options, create an editable text box
+        return 'text', value
+
+    def device_property_info(self, name):
+        """Return docstring of property and if it can be set. None if name isn't an attribute of device
+        :param name: name of property"""
+
+        if self.device_schema is not None and name in self.device_schema.properties:
+            return self.device_schema.docstrings[name], self.device_schema.setters[name]
+        elif attr := getattr(self.device_object, name, False):
+            return attr.__doc__, bool(getattr(attr, 'fset', False))
+
+    def _register_property(self, name, value):
+        """Add property and keys of nested dictionaries as attributes so values are available before widgets are built
+        :param name: name of property
+        :param value: value of property"""
+
+        self._property_names.add(name)
+        self._set_property(name, value)
+
+    def _set_property(self, name, value):
+        """Set property value. Dotted names are written directly into their nested dictionary so it stays the only
+        copy of the value
+        :param name: name of property
+        :param value: new value of property"""
+
+        if (accessor := self._accessors.get(name)) is not None:
+            container, key = accessor
+            previous = container.get(key)
+            container[key] = value
+        else:
+            previous = self.__dict__.get(name)
+            self.__dict__[name] = value
+        if type(previous) in [dict, ruamel.yaml.comments.CommentedMap]:  # keys of replaced dictionary may be gone
+            self._drop_accessors(name)
+        if type(value) in [dict, ruamel.yaml.comments.CommentedMap]:
+            self._compile_accessors(name, value)
+
+    def _drop_accessors(self, name):
+        """Forget dotted names of keys under dictionary property so they don't resolve into a replaced dictionary
+        :param name: name of dictionary property"""
+
+        prefix = f'{name}.'
+        for dotted in [dotted for dotted in self._accessors if dotted.startswith(prefix)]:
+            del self._accessors[dotted]
+            self._property_names.discard(dotted)
+
+    def _compile_accessors(self, name, dictionary):
+        """Map dotted names of all keys in nested dictionary to their container so access doesn't walk the path
+        :param name: name of dictionary property
+        :param dictionary: value of dictionary property"""
+
+        for k, v in dictionary.items():
+            self._property_names.add(f'{name}.{k}')
+            self._accessors[f'{name}.{k}'] = (dictionary, k)
+            if type(v) in [dict, ruamel.yaml.comments.CommentedMap]:
+                self._compile_accessors(f'{name}.{k}', v)
+
+    def create_lazy_group(self, name, title):
+        """Create collapsible widget for nested dictionary property. Widgets are built when first expanded or accessed
+        :param name: name of nested dictionary property
+        :param title: text of collapsible header"""
+
+        group = QLazyCollapsibleWidget(title, lambda: self._build_lazy_group(name))
+        self._lazy_groups[name] = group
+        return group
+
+    def _build_lazy_group(self, name):
+        """Build widgets of nested dictionary property from current attribute values
+        :param name: name of nested dictionary property"""
+
+        self._lazy_groups.pop(name, None)
+        properties = {f'{name}.{k}': getattr(self, f'{name}.{k}') for k in getattr(self, name).keys()}
+        if self.flat_layout:
+            return self.create_property_form(properties, name)
+        return create_widget('V', **self.create_property_widgets(properties, name))
+
+    def create_pending_widget(self, name, pending):
+        """Create placeholder for property whose value hasn't been read yet
+        :param name: name of property
+        :param pending: PendingProperty of property"""
+
+        placeholder = QLabel(f'{label_maker(name)}: reading...')
+        placeholder.setDisabled(True)
+        pending.future.add_done_callback(lambda future: self.PendingPropertyArrived.emit(name, future))
+        return placeholder
+
+    @Slot(str, object)
+    def fill_pending_property(self, name, future):
+        """Replace placeholder of property with widgets once value has been read
+        :param name: name of property
+        :param future: finished future of property getter"""
+
+        placeholder = self.property_widgets.get(name)
+        try:
+            value = future.result()
+        except Exception as e:
+            self.log.error(f'reading {name} failed: {e}')
+            if placeholder is not None:
+                placeholder.setText(f'{label_maker(name)}: unavailable')
+            return
+        if self.property_backend == 'model':
+            if value is not None:
+                self._register_property(name, value)
+                self.property_model.add_property(name)
+            return
+        if self.flat_layout:
+            self._fill_pending_row(name, placeholder, value)
+            return
+        if value is None:  # properties without value aren't displayed
+            widget = None
+        else:
+            widget = self.create_property_widgets({name: value}, name)[name]
+            self.property_widgets[name] = widget
+        if placeholder.parentWidget() is not None and placeholder.parentWidget().layout() is not None:
+            if widget is not None:
+                placeholder.parentWidget().layout().replaceWidget(placeholder, widget)
+            else:
+                placeholder.parentWidget().layout().removeWidget(placeholder)
+        placeholder.deleteLater()
+        if value is None:
+            del self.property_widgets[name]
+
+    def _fill_pending_row(self, name, placeholder, value):
+        """Replace placeholder row of form with label and input of property
+        :param name: name of property
+        :param placeholder: placeholder widget spanning row
+        :param value: value read from device"""
+
+        layout = placeholder.parentWidget().layout()
+        row, _ = layout.getWidgetPosition(placeholder)
+        layout.removeRow(row)  # deletes placeholder
+        if value is None:  # properties without value aren't displayed
+            del self.property_widgets[name]
+            return
+        label, self.property_widgets[name] = self.create_form_row(name, value)
+        layout.insertRow(row, label, self.property_widgets[name])
+
     def create_attribute_widget(self, name, widget_type, values):
         """Create a widget and create coresponding attribute
                 :param name: name of property
@@ -90,23 +419,18 @@ class BaseDeviceWidget(QMainWindow):
         # options = values.keys() if widget_type == 'combo' else values
         box = getattr(self, f'create_{widget_type}_box')(name, values)
         setattr(self, f"{name}_widget", box)  # add attribute for widget input for easy access
+        self._rendered_text[name] = str(getattr(self, name))
 
         return box
 
+    @profiled('check_driver_variables')
     def check_driver_variables(self, name: str):
         """Check if there is variable in device driver that has name of
         property to inform input widget type and values
         :param name: name of property to search for"""
 
-        driver_vars = self.device_driver.__dict__
-        for variable in driver_vars:
-            x = re.search(variable, fr'\b{inflection.pluralize(name)}?\b', re.IGNORECASE)
-            if x is not None:
-                if type(driver_vars[variable]) in [dict, list]:
-                    return driver_vars[variable]
-                elif type(driver_vars[variable]) == enum.EnumMeta:  # if enum
-                    enum_class = getattr(self.device_driver, name)
-                    return {i.name: i.value for i in enum_class}
+        if self.device_schema is not None:  # dummy driver of dictionary has no variables
+            return self.device_schema.driver_options(name)
 
     def create_text_box(self, name, value):
         """Convenience function to build editable text boxes and add initial value and validator
@@ -116,18 +440,13 @@ class BaseDeviceWidget(QMainWindow):
         # TODO: better way to handle weird types that will crash QT?
         value_type = type(value)
         textbox = QScrollableLineEdit(str(value))
-        name_lst = name.split('.')
-        if len(name_lst) != 1:  # name is a dictionary and key pair split by .
-            # Must find dictionary each editing finish
-            textbox.editingFinished.connect(lambda:
-                                            pathGet(self.__dict__, name_lst[0:-1]).
-                                            __setitem__(name_lst[-1], value_type(textbox.text())))
-        textbox.editingFinished.connect(lambda: setattr(self, name, value_type(textbox.text())))
+        textbox.editingFinished.connect(lambda: self.set_from_widget(name, value_type(textbox.text())))
         textbox.editingFinished.connect(lambda: self.ValueChangedInside.emit(name))
 
         if value_type in (float, int):
             validator = QIntValidator() if value_type == int else QDoubleValidator()
             textbox.setValidator(validator)
+            textbox.set_debounce(self.wheel_commit_delay_ms, self.wheel_max_commit_rate_hz)
         return textbox
 
     def create_combo_box(self, name, items):
@@ -138,21 +457,38 @@ class BaseDeviceWidget(QMainWindow):
         options = items.keys() if type(items) in [dict, ruamel.yaml.comments.CommentedMap] else items
         box = QComboBox()
         box.addItems([str(x) for x in options])
-        name_lst = name.split('.')
-        if len(name_lst) != 1:  # name is a dictionary and key pair split by .
-            box.currentTextChanged.connect(lambda value:
-                                           pathGet(self.__dict__, name_lst[0:-1]).__setitem__(name_lst[-1], value))
-        box.currentTextChanged.connect(lambda value: setattr(self, name, value))
+        box.currentTextChanged.connect(lambda value: self.set_from_widget(name, value))
         box.setCurrentText(str(getattr(self, name)))
         # emit signal when changed so outside listener can update. needs to be after changing attribute
         box.currentTextChanged.connect(lambda: self.ValueChangedInside.emit(name))
         return box
 
     @Slot(str)
+    def schedule_property_update(self, name):
+        """Mark property as dirty and start timer to flush updates if not already running
+        :param name: name of attribute and widget"""
+
+        self._dirty_properties[name] = None  # dict keeps order of first change
+        if not self._update_timer.isActive():
+            self._update_timer.start()
+
+    @Slot()
+    def flush_property_updates(self):
+        """Update widgets of all dirty properties once. Values are read at flush so last value set wins"""
+
+        dirty, self._dirty_properties = self._dirty_properties, {}
+        for name in dirty:
+            self.update_property_widget(name)
+
+    @Slot(str)
+    @profiled('update_property_widget')
     def update_property_widget(self, name):
         """Update property widget. Triggers when attribute has been changed outside of widget
         :param name: name of attribute and widget"""
 
+        if self.property_backend == 'model':
+            self.property_model.property_changed(name)
+            return
         value = getattr(self, name, None)
         if type(value) not in [dict, ruamel.yaml.comments.CommentedMap]:  # single widget to set value for
             self._set_widget_text(name, value)
@@ -161,27 +497,76 @@ class BaseDeviceWidget(QMainWindow):
                 self.update_property_widget(f'{name}.{k}')
 
     def _set_widget_text(self, name, value):
-        """Set widget text if widget is QLineEdit or QCombobox
+        """Set widget text if widget is QLineEdit or QCombobox. Widgets already showing value aren't touched
         :param name: widget name to set text to
         :param value: value of text"""
 
-        if hasattr(self, f'{name}_widget'):
-            widget = getattr(self, f'{name}_widget')
+        if (widget := self.__dict__.get(f'{name}_widget')) is not None:  # don't build lazy widgets to update them
+            text = str(value)
+            if self._rendered_text.get(name) == text:
+                self.skipped_widget_writes += 1
+                return
             widget.blockSignals(True)  # block signal indicating change since changing internally
-            widget_type = type(widget)
-            if widget_type == QLineEdit:
-                widget.setText(str(value))
-            elif widget_type == QComboBox:
-                widget.setCurrentText(str(value))
+            if isinstance(widget, QLineEdit):
+                widget.setText(text)
+            elif isinstance(widget, QComboBox):
+                widget.setCurrentText(text)
             widget.blockSignals(False)
+            self._rendered_text[name] = text
         else:
             self.log.debug(f"{name} doesn't correspond to a widget")
 
+    @Slot(str, object)
+    def set_from_device(self, name, value):
+        """Set property to value reported by device and update corresponding widgets. Names that aren't properties of
+        widget are ignored so device reports can't overwrite other attributes
+        :param name: name of property
+        :param value: new value of property"""
+
+        if name not in self._property_names:
+            self.log.warning(f'ignoring value of {name} since it is not a property of widget')
+            return
+        self._set_property(name, value)
+        self._emit_outside(name)
+
+    def set_from_widget(self, name, value):
+        """Set property to value edited within widget. Widgets are not updated since they are the source of change
+        :param name: name of property
+        :param value: new value of property"""
+
+        self._set_property(name, value)
+        if name in self._rendered_text:  # widget shows edited value
+            self._rendered_text[name] = str(value)
+
+    def __getattr__(self, name):
+        """Resolve dotted property names through their nested dictionary and build lazy nested widgets if attribute
+        belongs to one. Only called when attribute isn't found"""
+
+        if (accessor := self.__dict__.get('_accessors', {}).get(name)) is not None:
+            container, key = accessor
+            return container[key]
+        lazy_groups = self.__dict__.get('_lazy_groups', {})
+        while group := next((path for path in lazy_groups
+                             if name.startswith(f'{path}.') or name == f'{path}_widgets'), None):
+            lazy_groups[group].materialize()
+        if name in self.__dict__:
+            return self.__dict__[name]
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
     def __setattr__(self, name, value):
-        """Overwrite __setattr__ to trigger update if property is changed"""
-        self.__dict__[name] = value
-        if currentframe().f_back.f_locals.get('self', None) != self:  # call from outside so update widgets
-            self.ValueChangedOutside.emit(name)
+        """Overwrite __setattr__ to trigger update if property is changed. Assigning a registered property is
+        treated as a change from outside the widget, other attributes are set without emitting. Only assign from the
+        gui thread. Device threads should push changes through a DeviceUpdateBridge"""
+        if name in self._property_names:  # property changed from outside so update widgets
+            container, key = self._accessors.get(name) or (self.__dict__, name)
+            if type(value) in [dict, ruamel.yaml.comments.CommentedMap] \
+                    or type(container.get(key)) in [dict, ruamel.yaml.comments.CommentedMap]:
+                self._set_property(name, value)  # keeps dotted names of nested dictionaries current
+            else:  # plain value is stored without going through _set_property since this runs for every set
+                container[key] = value
+            self._emit_outside(name)
+        else:
+            self.__dict__[name] = value
 
 # Convenience Functions
 def create_widget(struct: str, *args, **kwargs):
@@ -233,21 +618,109 @@ def pathGet(dictionary: dict, path: list):
         dictionary = dictionary[k]
     return dictionary
 
-def scan_for_properties(device):
+class PendingProperty:
+    """Placeholder value for property whose getter hadn't returned when scan timed out"""
+
+    def __init__(self, future):
+        """
+        :param future: future of property getter"""
+
+        self.future = future
+
+
+def read_property(device, attr_name):
+    """Read property of device returning None if it can't be read yet
+    :param device: object to read property from
+    :param attr_name: name of property"""
+
+    try:
+        return getattr(device, attr_name, None)
+    except ValueError:  # Some attributes in processes raise ValueError if not started
+        return None
+
+
+class PropertyScan:
+    """Reads properties of a device on its own thread, one getter after another under the device lock, resolving a
+    future for each property as its value arrives. Scans of different devices run at the same time"""
+
+    def __init__(self, device):
+        """
+        :param device: object to read properties from"""
+
+        self.device = device
+        self.futures = {attr_name: Future() for attr_name in get_device_schema(type(device)).properties}
+        self.started = {}  # property names mapping to monotonic time their getter started
+        self._condition = Condition()
+        Thread(target=self._read, daemon=True, name=f'property_scan_{type(device).__name__}').start()
+
+    def _read(self):
+        """Read properties in order. Runs in scan thread"""
+
+        device_lock = get_device_lock(self.device)
+        for attr_name, future in self.futures.items():
+            future.set_running_or_notify_cancel()
+            with device_lock:
+                with self._condition:
+                    self.started[attr_name] = monotonic()
+                    self._condition.notify_all()
+                try:
+                    value = read_property(self.device, attr_name)
+                except Exception as e:
+                    future.set_exception(e)
+                    continue
+            future.set_result(value)
+
+    def result(self, timeout_s: float):
+        """Return properties read within timeout_s of their getter starting. Properties not read in time are returned
+        as PendingProperty. Since getters of a device run one after another, properties after a getter that timed out
+        are pending too and arrive once it returns
+        :param timeout_s: longest time each getter is waited for. None waits for every getter"""
+
+        prop_dict = {}
+        stalled = False
+        for attr_name, future in self.futures.items():
+            if not stalled:
+                with self._condition:  # starts as soon as previous getter returned
+                    self._condition.wait_for(lambda: attr_name in self.started)
+                remaining = None if timeout_s is None else max(0, self.started[attr_name] + timeout_s - monotonic())
+                stalled = not wait([future], timeout=remaining).done
+            if stalled:
+                prop_dict[attr_name] = PendingProperty(future)
+            elif future.exception() is None and (value := future.result()) is not None:
+                prop_dict[attr_name] = value
+        return prop_dict
+
+
+def start_property_scans(devices):
+    """Start reading properties of several devices at once, before their widgets are built, so startup is bounded by
+    the slowest device rather than the sum of all devices. scan_for_properties of each device picks up its scan
+    :param devices: device objects"""
+
+    for device in devices:
+        _scans.setdefault(device, lambda: PropertyScan(device))
+
+
+@profiled('scan_for_properties')
+def scan_for_properties(device, timeout_s: float = None):
     """Scan for properties with setters and getters in class and return dictionary
     :param device: object to scan through for properties
+    :param timeout_s: if given, getters run in background and properties whose getter hasn't returned within timeout
+    are returned as PendingProperty to be filled in by widget when they arrive. Getters of one device run one after
+    another under its device lock. Use start_property_scans to scan several devices at once
     """
 
-    prop_dict = {}
-    for attr_name in dir(device):
-        try:
-            attr = getattr(type(device), attr_name, None)
-            if isinstance(attr, property) and getattr(device, attr_name, None) is not None:
-                prop_dict[attr_name] = getattr(device, attr_name)
-        except ValueError:  # Some attributes in processes raise ValueError if not started
-            pass
-
-    return prop_dict
+    if (restored := take_restored_properties(device)) is not None:  # saved session is reconciled with hardware later
+        return restored
+    if (model := find_property_model(device)) is not None:  # views of device share values already read
+        return model.properties()
+    started = _scans.pop(device)
+    if timeout_s is None and started is None:
+        names = get_device_schema(type(device)).properties
+        values = {attr_name: read_property(device, attr_name) for attr_name in names}
+        return {attr_name: value for attr_name, value in values.items() if value is not None}
+
+    scan = started if started is not None else PropertyScan(device)
+    return scan.result(timeout_s)
 
 def disable_button(button, pause=1000):
     """Function to disable button clicks for a period of time to avoid crashing gui"""
@@ -0,0 +1,120 @@
+import importlib
+import enum
+import weakref
+import inflection
+
+_schemas = weakref.WeakKeyDictionary()
+_driver_indexes = {}
+
+
+class DeviceSchema:
+    """Introspected description of a device class shared by every widget built for that class"""
+
+    def __init__(self, device_class: type, driver):
+        """
+        :param device_class: class of device
+        :param driver: module device class is defined in"""
+
+        self.device_class = device_class
+        self.driver = driver
+        self.spec = driver.__spec__  # replaced when module is reloaded
+        self.properties = {}
+        for attr_name in dir(device_class):
+            attr = getattr(device_class, attr_name, None)
+            if isinstance(attr, property):
+                self.properties[attr_name] = attr
+        self.setters = {name: prop.fset is not None for name, prop in self.properties.items()}
+        self.docstrings = {name: prop.__doc__ for name, prop in self.properties.items()}
+        self.driver_index = get_driver_index(driver)
+
+    def driver_options(self, name: str):
+        """Return options of property found in device driver
+        :param name: name of property to search for"""
+
+        return self.driver_index.lookup(name)
+
+    def is_current(self):
+        """Check if driver module has not been reloaded since schema was built"""
+
+        return importlib.import_module(self.device_class.__module__).__spec__ is self.spec
+
+
+def get_device_schema(device_class: type):
+    """Return cached schema of device class, building it if class is new or its module was reloaded
+    :param device_class: class of device"""
+
+    schema = _schemas.get(device_class)
+    if schema is None or not schema.is_current():
+        schema = DeviceSchema(device_class, importlib.import_module(device_class.__module__))
+        _schemas[device_class] = schema
+    return schema
+
+
+def clear_device_schemas():
+    """Remove all cached schemas and driver indexes"""
+
+    _schemas.clear()
+    _driver_indexes.clear()
+
+
+class DriverIndex:
+    """One time index of the variables in a driver module that can be used as property options"""
+
+    def __init__(self, driver):
+        """
+        :param driver: module of device"""
+
+        self.driver = driver
+        self.spec = getattr(driver, '__spec__', None)  # replaced when module is reloaded
+        # only dictionaries, lists and enums can be options so other variables are skipped. Module order is kept
+        # since first matching variable wins
+        self.options = [(variable.lower(), value) for variable, value in vars(driver).items()
+                        if type(value) in [dict, list] or type(value) == enum.EnumMeta]
+        self._matches = {}
+
+    def lookup(self, name: str):
+        """Return options of first variable whose name is contained in the pluralized property name. Result is
+        memoized so repeated lookups of a name are a single dictionary access
+        :param name: name of property to search for"""
+
+        if name not in self._matches:
+            self._matches[name] = self._match(name)
+        match = self._matches[name]
+        if type(match) == enum.EnumMeta:  # if enum
+            enum_class = getattr(self.driver, name)
+            return {i.name: i.value for i in enum_class}
+        return match
+
+    def _match(self, name: str):
+        """Find first option variable matching name. Variable names are plain identifiers so a case insensitive
+        substring check gives the same result as searching the pattern '\\b<plural name>?\\b' with the variable
+        :param name: name of property to search for"""
+
+        pattern = fr'\b{inflection.pluralize(name)}?\b'.lower()
+        for variable, value in self.options:
+            if variable in pattern:
+                return value
+
+    def is_current(self):
+        """Check if module has not been reloaded since index was built"""
+
+        return getattr(self.driver, '__spec__', None) is self.spec
+
+
+def get_driver_index(driver):
+    """Return cached index of driver module, building it if module is new or was reloaded
+    :param driver: module of device"""
+
+    index = _driver_indexes.get(driver.__name__)
+    if index is None or index.driver is not driver or not index.is_current():
+        index = DriverIndex(driver)
+        _driver_indexes[driver.__name__] = index
+    return index
+
+
+def find_driver_variables(driver, name: str):
+    """Check if there is variable in device driver that has name of property and return its options
+    :param driver: module of device
+    :param name: name of property to search for"""
+
+    return get_driver_index(driver).lookup(name)
@@ -0,0 +1 @@
+"""Services that move property values between devices and widgets"""
@@ -0,0 +1,97 @@
+from qtpy.QtCore import QObject, Signal
+from threading import Thread, Event
+import logging
+import sys
+from instrument_widgets.device_services.device_locks import get_device_lock
+
+
+def driver_buffer_size(camera):
+    """Return BUFFER_SIZE_FRAMES of module camera class is defined in, or None if module has none
+    :param camera: camera object"""
+
+    return getattr(sys.modules.get(type(camera).__module__), 'BUFFER_SIZE_FRAMES', None)
+
+
+class AcquisitionMonitor(QObject):
+    """Polls get_camera_acquisition_state of a camera on a worker thread and checks each state for throughput trouble.
+    An alarm is raised when frames waiting in the input buffer reach buffer_alarm_fraction of the buffer size or when
+    dropped frames increase. The buffer alarm clears once the buffer drains while the dropped frame alarm stays until
+    monitor is restarted so short bursts of drops aren't missed"""
+
+    stateSampled = Signal(dict)
+    alarmChanged = Signal(bool, str)  # if alarm is raised, reason
+    buffer_alarm_fraction = .75  # fraction of input buffer that raises alarm when filled
+
+    def __init__(self, camera, rate_hz: float = 2, buffer_size: int = None):
+        """
+        :param camera: camera object with get_camera_acquisition_state
+        :param rate_hz: states read per second
+        :param buffer_size: frames input buffer holds. Taken from BUFFER_SIZE_FRAMES of driver module if not given"""
+
+        super().__init__()
+        self.log = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.camera = camera
+        self.camera_lock = get_device_lock(camera)
+        self.rate_hz = rate_hz
+        self.buffer_size = buffer_size if buffer_size is not None else driver_buffer_size(camera)
+        self.reason = ''  # reason for alarm or empty string if no alarm
+        self._first_dropped = None
+        self._stop = Event()
+        self._stop.set()
+        self._worker = None
+
+    def is_running(self):
+        """If states are being polled"""
+
+        return not self._stop.is_set()
+
+    def start(self):
+        """Start polling. Dropped frames are counted from first state read after starting"""
+
+        if self.is_running():
+            return
+        self._stop = Event()  # new event per run so a worker still finishing its last read of a previous run exits
+        self._first_dropped = None
+        self.reason = ''
+        self._worker = Thread(target=self._poll, args=(self._stop,), daemon=True)
+        self._worker.start()
+
+    def stop(self):
+        """Stop polling after current read returns"""
+
+        self._stop.set()
+
+    def check(self, state: dict):
+        """Return reason for alarm or empty string if state looks healthy
+        :param state: acquisition state of camera"""
+
+        reasons = []
+        dropped = state.get('dropped_frames')
+        if dropped is not None:
+            if self._first_dropped is None or dropped < self._first_dropped:  # count resets when camera restarts
+                self._first_dropped = dropped
+            if dropped > self._first_dropped:
+                reasons.append(f'{dropped - self._first_dropped} frame(s) dropped')
+        occupancy = state.get('in_buffer_size')
+        if self.buffer_size and occupancy is not None and occupancy >= self.buffer_alarm_fraction * self.buffer_size:
+            reasons.append(f'buffer {occupancy}/{self.buffer_size} full')
+        return ', '.join(reasons)
+
+    def _poll(self, stop: Event):
+        """Read and check states until stopped. Runs in worker thread
+        :param stop: event of this run"""
+
+        while not stop.wait(1 / self.rate_hz):
+            try:
+                with self.camera_lock:
+                    state = self.camera.get_camera_acquisition_state()
+            except Exception as e:  # camera may not have started acquiring yet
+                self.log.debug(f'reading acquisition state failed: {e}')
+                continue
+            if not state or stop.is_set():  # stopped while reading
+                continue
+            self.stateSampled.emit(state)
+            reason = self.check(state)
+            if reason != self.reason:
+                self.reason = reason
+                self.alarmChanged.emit(bool(reason), reason)
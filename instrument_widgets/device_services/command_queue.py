@@ -0,0 +1,130 @@
+from qtpy.QtCore import QObject, Signal
+from threading import Thread, Condition
+from time import monotonic
+import logging
+import copy
+from instrument_widgets.device_services.device_locks import get_device_lock
+
+
+class DeviceCommandQueue(QObject):
+    """Outbound queue of property writes to a device applied on a worker thread. Pending writes to the same property
+    are coalesced so only the last value is written, while writes to different properties keep their order. Read backs
+    of a property are only reported once no newer write of it is queued so views don't jump back to stale values"""
+
+    commandCompleted = Signal(str, object)
+    commandFailed = Signal(str, object)
+    queueDepthChanged = Signal(int)
+
+    def __init__(self, device, read_back: bool = True):
+        """
+        :param device: device object to write properties to
+        :param read_back: if property is read from device after writing and reported instead of written value"""
+
+        super().__init__()
+        self.log = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.device = device
+        self.device_lock = get_device_lock(device)
+        self.read_back = read_back
+        self.coalesced = 0  # number of writes replaced by a newer value before being applied
+        self._pending = {}  # dict keeps order properties were first queued in
+        self._writing = None  # name of property being written
+        self._completed_at = {}  # property names mapping to monotonic time their last write finished
+        self._condition = Condition()
+        self._running = True
+        self._worker = Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit(self, name: str, value):
+        """Queue write of property. Replaces value of pending write to same property
+        :param name: name of property
+        :param value: value to write"""
+
+        with self._condition:
+            if name in self._pending:
+                self.coalesced += 1
+            self._pending[name] = value
+            depth = len(self._pending)
+            self._condition.notify()
+        self.queueDepthChanged.emit(depth)
+
+    def depth(self):
+        """Number of writes waiting to be applied"""
+
+        with self._condition:
+            return len(self._pending)
+
+    def is_pending(self, name: str):
+        """If a write of property is queued or being applied, so values read from device may be stale
+        :param name: name of property"""
+
+        with self._condition:
+            return name in self._pending or name == self._writing
+
+    def completed_at(self, name: str):
+        """Monotonic time last write of property finished on device, taken under device lock, or None if it was never
+        written. Reads of property that finished earlier returned the value from before that write
+        :param name: name of property"""
+
+        with self._condition:
+            return self._completed_at.get(name)
+
+    def connect_widget(self, widget):
+        """Queue writes when widget is edited and report results back to widget
+        :param widget: BaseDeviceWidget of device"""
+
+        # nested edits are written as the whole top level property. Copied since widget edits its dictionaries in place
+        widget.ValueChangedInside[str].connect(lambda name: self.submit(name.split('.')[0],
+                                                                        copy.deepcopy(getattr(widget,
+                                                                                              name.split('.')[0]))))
+        if self.read_back:  # show value device actually accepted
+            self.commandCompleted.connect(widget.set_from_device)
+
+    def stop(self, wait: bool = True):
+        """Apply remaining writes and stop worker thread
+        :param wait: if call returns only once remaining writes are applied"""
+
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        if wait:
+            self._worker.join()
+
+    def _run(self):
+        """Apply queued writes in order until stopped"""
+
+        while True:
+            with self._condition:
+                while not self._pending and self._running:
+                    self._condition.wait()
+                if not self._pending:  # stopped and nothing left to write
+                    return
+                name = next(iter(self._pending))
+                value = self._pending.pop(name)
+                self._writing = name
+                depth = len(self._pending)
+            self.queueDepthChanged.emit(depth)
+            self._write(name, value)
+
+    def _write(self, name: str, value):
+        """Write property to device and report result
+        :param name: name of property
+        :param value: value to write"""
+
+        try:
+            with self.device_lock:
+                setattr(self.device, name, value)
+                if self.read_back:
+                    value = getattr(self.device, name)
+                completed_at = monotonic()
+        except Exception as e:
+            with self._condition:
+                self._writing = None
+            self.log.error(f'writing {name} failed: {e}')
+            self.commandFailed.emit(name, e)
+        else:
+            with self._condition:
+                self._writing = None
+                self._completed_at[name] = completed_at
+                superseded = name in self._pending
+            if not superseded:  # newer write will report its own result
+                self.commandCompleted.emit(name, value)
@@ -0,0 +1,11 @@
+from threading import RLock
+from instrument_widgets.device_services.device_registry import DeviceRegistry
+
+_locks = DeviceRegistry()  # doesn't keep devices alive
+
+
+def get_device_lock(device):
+    """Return lock shared by every service accessing device so a single port is never accessed concurrently
+    :param device: device object"""
+
+    return _locks.setdefault(device, RLock)
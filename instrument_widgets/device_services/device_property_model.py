@@ -0,0 +1,145 @@
+from qtpy.QtCore import QObject, Signal, Slot
+from threading import Lock
+import logging
+import weakref
+import copy
+from instrument_widgets.device_schema import get_device_schema
+from instrument_widgets.device_services.device_locks import get_device_lock
+from instrument_widgets.device_services.device_registry import DeviceRegistry
+from instrument_widgets.device_services.command_queue import DeviceCommandQueue
+from instrument_widgets.device_services.property_poller import values_differ
+
+_models = DeviceRegistry()  # weak references to models so a model lives only as long as its views and owner
+_models_lock = Lock()
+
+
+def get_property_model(device):
+    """Return property model shared by every view of device, creating it on first use. Keep a reference to the model
+    or attach views to it, otherwise it is discarded. Call from gui thread
+    :param device: device object"""
+
+    with _models_lock:
+        if (model := find_property_model(device)) is None:
+            model = DevicePropertyModel(device)
+            _models.set(device, weakref.ref(model))
+        return model
+
+
+def find_property_model(device):
+    """Return property model of device if one exists
+    :param device: device object"""
+
+    reference = _models.get(device)
+    return None if reference is None else reference()
+
+
+class DevicePropertyModel(QObject):
+    """Single copy of a device's property values shared by several BaseDeviceWidgets. The device is read once for all
+    views and edits from any view are written through one DeviceCommandQueue and shown in every other view.
+    While a model exists, scan_for_properties of its device returns the model's values instead of reading hardware"""
+
+    valueChanged = Signal(str, object)
+
+    def __init__(self, device):
+        """
+        :param device: device object"""
+
+        super().__init__()
+        self.log = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.device = device
+        self.device_lock = get_device_lock(device)
+        self.values = {}
+        self.views = []
+        self.commands = DeviceCommandQueue(device)
+        self.commands.commandCompleted.connect(self.update)  # queued since emitted by worker thread
+        weakref.finalize(self, self.commands.stop, False)  # worker applies writes still queued then exits
+        self.refresh()
+
+    def refresh(self):
+        """Read every property of device"""
+
+        for name in get_device_schema(type(self.device)).properties:
+            try:
+                with self.device_lock:
+                    value = getattr(self.device, name)
+            except Exception as e:
+                self.log.warning(f'reading {name} failed: {e}')
+                continue
+            if value is not None:
+                self.values[name] = value
+
+    def properties(self):
+        """Return copy of property values to build a view from. Views get their own copy since they edit nested
+        dictionaries in place"""
+
+        return copy.deepcopy(self.values)
+
+    def attach(self, widget):
+        """Show values of model in widget and write its edits through model
+        :param widget: BaseDeviceWidget of device"""
+
+        self.views.append(widget)
+        widget.ValueChangedInside[str].connect(lambda name: self.submit(widget, name))
+        widget.destroyed.connect(lambda: self.detach(widget))
+
+    def detach(self, widget):
+        """Stop updating widget
+        :param widget: attached BaseDeviceWidget"""
+
+        if widget in self.views:
+            self.views.remove(widget)
+
+    def poll(self, poller, rates: dict):
+        """Poll device once for all views
+        :param poller: PropertyPoller to add device to
+        :param rates: dictionary of property names mapping to polling rate in Hz
+        :return: poll queue of device"""
+
+        queue = poller.add_device(self.device, rates)
+        queue.valueRead.connect(self.update_polled)  # queued since emitted by worker thread
+        return queue
+
+    def submit(self, widget, name: str):
+        """Write edit made in view to device and show it in the other views
+        :param widget: view edit was made in
+        :param name: name of edited property. Nested edits are written as the whole top level property"""
+
+        name = name.split('.')[0]
+        value = copy.deepcopy(getattr(widget, name))
+        self.values[name] = value
+        self._broadcast(name, value, source=widget)
+        self.commands.submit(name, value)
+
+    @Slot(str, object)
+    def update(self, name: str, value):
+        """Set value read from device and show it in every view. Values of a property with a queued write are ignored
+        since they predate the edit
+        :param name: name of property
+        :param value: value of property"""
+
+        if self.commands.is_pending(name):
+            return
+        if name in self.values and not values_differ(value, self.values[name]):
+            return
+        self.values[name] = value
+        self._broadcast(name, value)
+
+    @Slot(str, object, float)
+    def update_polled(self, name: str, value, read_at: float):
+        """Set value polled from device unless it was read before the last write of property finished. Such reads may
+        only be processed after the write completed, when nothing is pending anymore
+        :param name: name of property
+        :param value: value of property
+        :param read_at: monotonic time value was read"""
+
+        if (completed_at := self.commands.completed_at(name)) is not None and read_at < completed_at:
+            return
+        self.update(name, value)
+
+    def _broadcast(self, name, value, source=None):
+        """Set value on views other than source"""
+
+        for view in self.views:
+            if view is not source and name in view._property_names:
+                view.set_from_device(name, copy.deepcopy(value))
+        self.valueChanged.emit(name, value)
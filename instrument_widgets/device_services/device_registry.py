@@ -0,0 +1,88 @@
+from threading import Lock
+import weakref
+
+
+class DeviceRegistry:
+    """Dictionary of values kept per device object that doesn't keep devices alive. Entries are keyed by id, since
+    devices may not be hashable, and removed when their device is garbage collected so a reused id never finds the
+    entry of a freed device. Devices that can't be weakly referenced are kept alive by their entry instead"""
+
+    def __init__(self):
+        self._entries = {}  # ids of devices mapping to (strong reference or None, value)
+        self._freed = []  # ids of garbage collected devices whose entries haven't been removed yet
+        self._lock = Lock()
+
+    def get(self, device, default=None):
+        """Return value of device or default if it has none
+        :param device: device object"""
+
+        with self._lock:
+            self._purge()
+            entry = self._entries.get(id(device))
+        return default if entry is None else entry[1]
+
+    def setdefault(self, device, factory):
+        """Return value of device, creating it with factory on first use
+        :param device: device object
+        :param factory: function returning value of new entry"""
+
+        with self._lock:
+            self._purge()
+            if (entry := self._entries.get(id(device))) is not None:
+                return entry[1]
+            value = factory()
+            self._add(device, value)
+            return value
+
+    def set(self, device, value):
+        """Set value of device
+        :param device: device object
+        :param value: value of device"""
+
+        with self._lock:
+            self._purge()
+            self._add(device, value)
+
+    def pop(self, device, default=None):
+        """Remove and return value of device or default if it has none
+        :param device: device object"""
+
+        with self._lock:
+            self._purge()
+            entry = self._entries.pop(id(device), None)
+        return default if entry is None else entry[1]
+
+    def __contains__(self, device):
+        with self._lock:
+            self._purge()
+            return id(device) in self._entries
+
+    def __len__(self):
+        with self._lock:
+            self._purge()
+            return len(self._entries)
+
+    def _add(self, device, value):
+        """Add entry and arrange its removal with device. Call with lock held"""
+
+        key = id(device)
+        if key in self._entries:
+            self._entries[key] = (self._entries[key][0], value)
+            return
+        try:
+            weakref.finalize(device, self._forget, key)
+            self._entries[key] = (None, value)
+        except TypeError:  # can't be weakly referenced so keep device alive to keep its id unique
+            self._entries[key] = (device, value)
+
+    def _forget(self, key):
+        """Mark entry of garbage collected device for removal. Collection can happen while lock is held so entry is
+        removed on next access instead"""
+
+        self._freed.append(key)
+
+    def _purge(self):
+        """Remove entries of garbage collected devices. Call with lock held, before id of a new device is looked up"""
+
+        while self._freed:
+            self._entries.pop(self._freed.pop(), None)
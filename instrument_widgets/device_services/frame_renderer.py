@@ -0,0 +1,70 @@
+from time import monotonic
+import numpy
+
+
+class FrameRenderer:
+    """Converts uint16 frames to uint8 for display through a lookup table that is only rebuilt when levels change.
+    With auto contrast, levels are set from percentiles of a histogram of a sparse subsample of pixels, updated at a
+    lower rate than frames arrive. Frames of other types are passed through unchanged"""
+
+    def __init__(self, auto_contrast: bool = True, percentiles: tuple = (0.5, 99.5), sample_count: int = 65536,
+                 contrast_interval_s: float = 0.5):
+        """
+        :param auto_contrast: if levels follow the frames
+        :param percentiles: lower and upper percentile of pixels mapped to black and white
+        :param sample_count: about how many pixels are sampled for auto contrast
+        :param contrast_interval_s: least time between auto contrast updates"""
+
+        self.auto_contrast = auto_contrast
+        self.percentiles = percentiles
+        self.sample_count = sample_count
+        self.contrast_interval_s = contrast_interval_s
+        self.levels = (0, 65535)
+        self.lut_builds = 0
+        self._lut = None
+        self._lut_levels = None
+        self._last_contrast_s = None
+
+    def set_levels(self, low: int, high: int):
+        """Set levels mapped to black and white and turn off auto contrast
+        :param low: value shown as black
+        :param high: value shown as white"""
+
+        self.auto_contrast = False
+        self.levels = (int(low), int(high))
+
+    def lut(self):
+        """Return lookup table of current levels, building it if levels changed"""
+
+        if self._lut_levels != self.levels:
+            low, high = self.levels
+            values = numpy.arange(65536, dtype=numpy.float32)
+            scale = 255 / max(high - low, 1)
+            self._lut = numpy.clip((values - low) * scale, 0, 255).astype(numpy.uint8)
+            self._lut_levels = self.levels
+            self.lut_builds += 1
+        return self._lut
+
+    def auto_levels(self, frame):
+        """Return levels at percentiles of pixels sampled on a regular grid
+        :param frame: uint16 frame"""
+
+        step = max(1, int((frame.size / self.sample_count) ** 0.5))
+        sample = frame[::step, ::step].ravel()
+        cumulative = numpy.cumsum(numpy.bincount(sample, minlength=65536))
+        low, high = numpy.searchsorted(cumulative, [p / 100 * cumulative[-1] for p in self.percentiles])
+        high = min(max(int(high), int(low) + 1), 65535)  # saturated frames keep white at top of range
+        return min(int(low), high - 1), high
+
+    def render(self, frame):
+        """Map frame to uint8 with current levels, updating levels first if auto contrast is due
+        :param frame: frame to render"""
+
+        if frame.dtype != numpy.uint16:
+            return frame
+        now = monotonic()
+        if self.auto_contrast and (self._last_contrast_s is None or
+                                   now - self._last_contrast_s >= self.contrast_interval_s):
+            self.levels = self.auto_levels(frame)
+            self._last_contrast_s = now
+        return self.lut()[frame]
@@ -0,0 +1,230 @@
+from qtpy.QtCore import QObject, Signal, Slot, QTimer, QRectF
+from pyqtgraph import ImageView, ImageItem
+from threading import Thread, Lock, Event, Condition
+import logging
+import math
+import numpy
+from instrument_widgets.device_services.device_locks import get_device_lock
+from instrument_widgets.device_services.frame_renderer import FrameRenderer
+
+
+def display_factor(shape: tuple, display_px: int):
+    """Return smallest integer factor that reduces frame to at most display_px along each side
+    :param shape: shape of frame
+    :param display_px: most pixels shown along a side"""
+
+    return max(1, math.ceil(max(shape[0], shape[1]) / display_px))
+
+
+def downsample(frame, factor: int, method: str = 'stride'):
+    """Reduce frame by integer factor along both sides
+    :param frame: 2D array
+    :param factor: reduction factor
+    :param method: 'stride' keeps every factor-th pixel, 'mean' averages factor x factor blocks. Mean is less noisy
+    but reads every pixel so it costs more on large frames"""
+
+    if factor == 1:
+        return frame
+    if method == 'mean':
+        rows, columns = frame.shape[0] // factor, frame.shape[1] // factor
+        blocks = frame[:rows * factor, :columns * factor].reshape(rows, factor, columns, factor)
+        return blocks.mean(axis=(1, 3), dtype=numpy.float32).astype(frame.dtype)
+    return numpy.ascontiguousarray(frame[::factor, ::factor])
+
+
+class LiveView(QObject):
+    """Streams frames of a camera to an image view. A worker thread starts the camera and grabs frames as fast as the
+    camera delivers them, keeping only the newest. The view shows the newest frame at its own display rate so a slow
+    display never backs up the camera buffer.
+    Frames are reduced to about display_px in the worker so display cost doesn't grow with sensor size. When zoomed
+    in, the visible region is also cut from the full resolution frame and shown on top. uint16 frames are mapped to
+    uint8 by renderer in the worker, so the view only draws bytes"""
+
+    countsChanged = Signal(int, int)  # frames grabbed, frames displayed
+    errorOccurred = Signal(object)
+    stopped = Signal()
+
+    def __init__(self, camera, image_view: ImageView = None, display_hz: float = 30, frame_count: int = 2**31 - 1,
+                 display_px: int = 2048, downsample_method: str = 'stride'):
+        """
+        :param camera: camera object with prepare, start, grab_frame and stop
+        :param image_view: view to show frames in. A new ImageView is created if not given
+        :param display_hz: most frames shown per second
+        :param frame_count: number of frames camera is started for
+        :param display_px: most pixels shown along a side of frame or zoomed region
+        :param downsample_method: 'stride' or 'mean' binning used to reduce frames"""
+
+        super().__init__()
+        self.log = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.camera = camera
+        self.camera_lock = get_device_lock(camera)
+        self.image_view = image_view if image_view is not None else ImageView()
+        self.frame_count = frame_count
+        self.display_px = display_px
+        self.downsample_method = downsample_method
+        self.renderer = FrameRenderer()
+        self.grabbed = 0
+        self.displayed = 0
+        self.full_frame = None  # newest frame at full resolution
+        self._frame_arrived = Condition()
+        self._latest = None
+        self._latest_lock = Lock()
+        self._crop_region = None  # (row, column, height, width) of zoomed region in full resolution pixels
+        self._running = Event()
+        self._streaming = Event()  # set from start until worker has stopped camera
+        self._worker = None
+        self._first_frame = True
+        self._display_timer = QTimer(self)
+        self._display_timer.setInterval(int(1000 / display_hz))
+        self._display_timer.timeout.connect(self.display)
+
+        self.crop_item = ImageItem(axisOrder='row-major')
+        self.crop_item.setZValue(1)
+        self.crop_item.hide()
+        self.image_view.getView().addItem(self.crop_item)
+        self.image_view.getView().sigRangeChanged.connect(self.update_crop_region)
+
+    def is_running(self):
+        """If frames are being grabbed"""
+
+        return self._running.is_set()
+
+    def is_streaming(self):
+        """If worker thread still has camera started, which outlasts is_running until the grab in progress at stop
+        returns"""
+
+        return self._streaming.is_set()
+
+    def wait_for_frame(self, timeout_s: float = None):
+        """Return newest full resolution frame, waiting for the first frame of a run if none has arrived yet. A grab in
+        progress when live view was stopped still delivers its frame. Call from a thread other than the gui thread
+        since it blocks
+        :param timeout_s: longest time to wait for a frame"""
+
+        with self._frame_arrived:
+            if not self._frame_arrived.wait_for(lambda: self.full_frame is not None or not self._streaming.is_set(),
+                                                timeout_s) or self.full_frame is None:
+                raise RuntimeError('live view stopped or timed out before a frame arrived')
+            return self.full_frame
+
+    def start(self):
+        """Start camera and display newest frames. Returns immediately
+        :return: False if worker of previous run hasn't stopped camera yet"""
+
+        if self._running.is_set():
+            return True
+        if self._streaming.is_set():
+            return False
+        self.grabbed = 0
+        self.displayed = 0
+        self.full_frame = None
+        self._first_frame = True
+        self._running.set()
+        self._streaming.set()
+        self._worker = Thread(target=self._grab, daemon=True)
+        self._worker.start()
+        self._display_timer.start()
+        return True
+
+    def stop(self):
+        """Stop grabbing frames. Camera is stopped by worker thread once its current grab returns"""
+
+        self._running.clear()
+        self._display_timer.stop()
+        self.display()  # show last frame grabbed
+
+    def process_frame(self, frame):
+        """Prepare frame for display. Runs in worker thread for every grabbed frame
+        :param frame: frame grabbed from camera
+        :return: reduced frame, reduction factor and crop of zoomed region or None"""
+
+        factor = display_factor(frame.shape, self.display_px)
+        image = self.renderer.render(downsample(frame, factor, self.downsample_method))
+        return image, factor, self.crop(frame, factor)
+
+    def crop(self, frame, factor: int):
+        """Cut zoomed region out of full resolution frame if it shows more detail than the reduced frame
+        :param frame: full resolution frame
+        :param factor: reduction factor of whole frame
+        :return: crop reduced to display_px, its factor and region, or None if not zoomed in"""
+
+        if (region := self._crop_region) is None:
+            return None
+        row, column, height, width = region
+        crop_factor = display_factor((height, width), self.display_px)
+        if crop_factor >= factor:  # reduced frame already shows region at this resolution
+            return None
+        crop = frame[row:row + height, column:column + width]
+        return self.renderer.render(downsample(crop, crop_factor, self.downsample_method)), crop_factor, region
+
+    @Slot(object, object)
+    def update_crop_region(self, view=None, view_range=None):
+        """Set region of full resolution frame to cut out when view is zoomed in"""
+
+        if self.full_frame is None:
+            return
+        (x_min, x_max), (y_min, y_max) = self.image_view.getView().viewRange()
+        height, width = self.full_frame.shape[:2]
+        column, row = max(0, int(x_min)), max(0, int(y_min))
+        region = (row, column, min(height, math.ceil(y_max)) - row, min(width, math.ceil(x_max)) - column)
+        zoomed = region[2] > 0 and region[3] > 0 and (region[2] < height or region[3] < width)
+        self._crop_region = region if zoomed else None
+        if not self._running.is_set():  # redraw crop of last frame since no new frames arrive
+            self._show_crop(self.crop(self.full_frame, display_factor(self.full_frame.shape, self.display_px)))
+
+    @Slot()
+    def display(self):
+        """Show newest frame if one arrived since last display"""
+
+        with self._latest_lock:
+            latest, self._latest = self._latest, None
+        if latest is None:
+            return
+        image, factor, crop = latest
+        # frames are indexed rows then columns while pyqtgraph expects x then y. Scale keeps full resolution coordinates
+        rendered = image.dtype == numpy.uint8  # renderer already applied levels
+        self.image_view.setImage(image, axes={'x': 1, 'y': 0}, scale=(factor, factor), autoRange=self._first_frame,
+                                 autoLevels=self._first_frame and not rendered,
+                                 levels=(0, 255) if rendered else None, autoHistogramRange=self._first_frame)
+        self._first_frame = False
+        self._show_crop(crop)
+        self.displayed += 1
+        self.countsChanged.emit(self.grabbed, self.displayed)
+
+    def _show_crop(self, crop):
+        """Show full resolution crop over reduced frame or hide it"""
+
+        if crop is None:
+            self.crop_item.hide()
+            return
+        image, factor, (row, column, height, width) = crop
+        self.crop_item.setImage(image, autoLevels=False, levels=self.image_view.getImageItem().levels)
+        self.crop_item.setRect(QRectF(column, row, image.shape[1] * factor, image.shape[0] * factor))
+        self.crop_item.show()
+
+    def _grab(self):
+        """Start camera and grab frames until stopped. Runs in worker thread"""
+
+        try:
+            with self.camera_lock:
+                self.camera.prepare()
+                self.camera.start(self.frame_count, live=True)
+            while self._running.is_set():
+                frame = self.camera.grab_frame()
+                with self._frame_arrived:
+                    self.full_frame = frame
+                    self._frame_arrived.notify_all()
+                latest = self.process_frame(self.full_frame)
+                with self._latest_lock:
+                    self._latest = latest  # replaces stale frame that wasn't displayed
+                self.grabbed += 1
+            with self.camera_lock:
+                self.camera.stop()
+        except Exception as e:
+            self.log.error(f'live view failed: {e}')
+            self._running.clear()
+            self.errorOccurred.emit(e)
+        with self._frame_arrived:  # wake snapshots waiting for a frame that won't come
+            self._streaming.clear()
+            self._frame_arrived.notify_all()
+        self.stopped.emit()
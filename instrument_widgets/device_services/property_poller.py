@@ -0,0 +1,185 @@
+from qtpy.QtCore import QObject, Signal
+from concurrent.futures import ThreadPoolExecutor
+from threading import Thread, Event, Lock
+from time import monotonic
+import logging
+import copy
+from instrument_widgets.device_services.device_locks import get_device_lock
+
+
+class DevicePollQueue(QObject):
+    """Polling schedule of a single device. Properties of a device are read one at a time so a single port is never
+    accessed concurrently. Connect valueChanged to BaseDeviceWidget.set_from_device to update widget"""
+
+    valueChanged = Signal(str, object)
+    valueRead = Signal(str, object, float)  # name, value and monotonic time read finished, taken under device lock
+    max_backoff = 16  # largest factor polling interval of a property is stretched by when its getter is slow
+    slow_fraction = .5  # getter is considered slow if it takes longer than this fraction of its interval
+
+    def __init__(self, device, rates: dict):
+        """
+        :param device: device object to read properties from
+        :param rates: dictionary of property names mapping to polling rate in Hz"""
+
+        super().__init__()
+        self.log = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.device = device
+        self.device_lock = get_device_lock(device)
+        self.backoffs = {}  # property names mapping to factor their polling interval is stretched by
+        self.busy = False
+        self._lock = Lock()
+        self._intervals = {}
+        self._next_due = {}
+        self._last_values = {}
+        for name, rate_hz in rates.items():
+            self.set_rate(name, rate_hz)
+
+    def set_rate(self, name: str, rate_hz: float):
+        """Set or change polling rate of property
+        :param name: name of property
+        :param rate_hz: polling rate in Hz. A rate of 0 stops polling of property"""
+
+        with self._lock:
+            if rate_hz <= 0:
+                self._intervals.pop(name, None)
+                self._next_due.pop(name, None)
+                return
+            self._intervals[name] = 1 / rate_hz
+            self._next_due[name] = monotonic()
+
+    def due(self, now: float):
+        """Return list of properties that are due to be polled
+        :param now: current monotonic time"""
+
+        with self._lock:
+            return [name for name, due in self._next_due.items() if due <= now]
+
+    def poll(self, names: list):
+        """Read properties from device and emit values that changed since last read. Runs in worker thread
+        :param names: names of properties to read"""
+
+        try:
+            for name in names:
+                start = monotonic()
+                try:
+                    with self.device_lock:
+                        value = getattr(self.device, name)
+                        read_at = monotonic()
+                except Exception as e:
+                    self.log.warning(f'polling {name} failed: {e}')
+                    self._reschedule(name, start, slow=True)
+                    continue
+                elapsed = monotonic() - start
+                interval = self._intervals.get(name)
+                if interval is None:  # polling stopped while reading
+                    continue
+                self._reschedule(name, start, slow=elapsed > interval * self.slow_fraction)
+                if name not in self._last_values or values_differ(value, self._last_values[name]):
+                    self._last_values[name] = copy.deepcopy(value)  # devices may change dictionaries in place
+                    self.valueChanged.emit(name, value)
+                    self.valueRead.emit(name, value, read_at)
+        finally:
+            self.busy = False
+
+    def _reschedule(self, name: str, start: float, slow: bool):
+        """Schedule next read of property and adjust its backoff based on how quickly its getter responded. Backoff is
+        kept per property so one slow getter doesn't slow polling of fast properties of the same device
+        :param name: name of property
+        :param start: time read started
+        :param slow: if getter responded slowly"""
+
+        with self._lock:
+            backoff = self.backoffs.get(name, 1)
+            if slow:
+                backoff = min(backoff * 2, self.max_backoff)
+            elif backoff > 1:
+                backoff = max(backoff / 2, 1)
+            self.backoffs[name] = backoff
+            if name in self._intervals:
+                self._next_due[name] = start + self._intervals[name] * backoff
+
+
+class PropertyPoller:
+    """Service that reads device properties on a worker thread pool at a configurable rate per property"""
+
+    def __init__(self, max_workers: int = 4, tick_ms: float = 10):
+        """
+        :param max_workers: number of worker threads. Each device only uses one worker at a time
+        :param tick_ms: how often schedule is checked for due properties"""
+
+        self.log = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.max_workers = max_workers
+        self.tick_ms = tick_ms
+        self.queues = {}
+        self._executor = None
+        self._scheduler = None
+        self._stop = Event()
+
+    def add_device(self, device, rates: dict, widget=None):
+        """Add device to be polled
+        :param device: device object to read properties from
+        :param rates: dictionary of property names mapping to polling rate in Hz
+        :param widget: optional BaseDeviceWidget to receive changed values
+        :return: poll queue of device"""
+
+        queue = DevicePollQueue(device, rates)
+        if widget is not None:
+            queue.valueChanged.connect(widget.set_from_device)
+        self.queues[id(device)] = queue
+        return queue
+
+    def remove_device(self, device):
+        """Stop polling device
+        :param device: device object to stop polling"""
+
+        self.queues.pop(id(device), None)
+
+    def set_rate(self, device, name: str, rate_hz: float):
+        """Set polling rate of device property
+        :param device: device object property belongs to
+        :param name: name of property
+        :param rate_hz: polling rate in Hz. A rate of 0 stops polling of property"""
+
+        self.queues[id(device)].set_rate(name, rate_hz)
+
+    def start(self):
+        """Start scheduler and worker threads"""
+
+        if self._scheduler is not None:
+            return
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='property_poller')
+        self._scheduler = Thread(target=self._schedule, daemon=True)
+        self._scheduler.start()
+
+    def stop(self):
+        """Stop scheduler and wait for running reads to finish"""
+
+        if self._scheduler is None:
+            return
+        self._stop.set()
+        self._scheduler.join()
+        self._executor.shutdown(wait=True)
+        self._scheduler = None
+        self._executor = None
+
+    def _schedule(self):
+        """Submit due properties of idle devices to worker pool until stopped"""
+
+        while not self._stop.wait(self.tick_ms / 1000):
+            now = monotonic()
+            for queue in list(self.queues.values()):
+                if queue.busy:  # device is still being read
+                    continue
+                if names := queue.due(now):
+                    queue.busy = True
+                    self._executor.submit(queue.poll, names)
+
+
+def values_differ(value, last_value):
+    """Compare values and fall back to reporting a change if comparison is ambiguous like with arrays"""
+
+    try:
+        return bool(value != last_value)
+    except (ValueError, TypeError):
+        return True
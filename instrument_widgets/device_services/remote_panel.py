@@ -0,0 +1,289 @@
+"""Run device panels in a separate process so a stalled gui can't hold up the process driving the devices.
+The device process runs a DeviceAgent and the panel process connects to it with a RemotePanelClient. Both sides send
+batches of property changes as ('diff', {name: value}) or ('set', {name: value}) over a local socket.
+DeviceAgent.launch_panel starts a panel with: python -m instrument_widgets.device_services.remote_panel <address>"""
+
+from qtpy.QtCore import QObject, Signal, Slot, QTimer, Qt
+from multiprocessing.connection import Listener, Client
+from threading import Thread, Lock, Event
+import subprocess
+import importlib
+import argparse
+import logging
+import copy
+import os
+import sys
+from instrument_widgets.device_schema import get_device_schema
+from instrument_widgets.device_services.device_locks import get_device_lock
+from instrument_widgets.device_services.property_poller import PropertyPoller
+from instrument_widgets.device_services.command_queue import DeviceCommandQueue
+
+AUTHKEY_ENV_VAR = 'INSTRUMENT_WIDGETS_AUTHKEY'  # hex authkey handed to panel processes started by launch_panel
+
+
+class DeviceAgent:
+    """Device side of a remote panel. Reports polled and written property values to the panel in batches and applies
+    property writes the panel sends through a DeviceCommandQueue. Doesn't need a gui or running event loop"""
+
+    def __init__(self, device, address: str, rates: dict = None, flush_interval_ms: float = 50, authkey: bytes = None):
+        """
+        :param device: device object served to panel
+        :param address: path of unix socket to listen on
+        :param rates: dictionary of property names mapping to polling rate in Hz
+        :param flush_interval_ms: how often changed values are sent to panel
+        :param authkey: key panel must present. Random if not given"""
+
+        self.log = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.device = device
+        self.device_lock = get_device_lock(device)
+        self.address = address
+        self.authkey = authkey if authkey is not None else os.urandom(16)
+        self.flush_interval_ms = flush_interval_ms
+        self.messages_sent = 0
+        self._diff = {}
+        self._diff_lock = Lock()
+        self._send_lock = Lock()  # connection isn't safe to send on from several threads
+        self._stop = Event()
+        self._connection = None
+
+        # direct connections since signals are emitted by worker threads and device process runs no event loop
+        self.poller = PropertyPoller()
+        self.poller.add_device(device, rates or {}).valueChanged.connect(self.queue_diff,
+                                                                         Qt.ConnectionType.DirectConnection)
+        self.commands = DeviceCommandQueue(device)
+        self.commands.commandCompleted.connect(self.queue_diff, Qt.ConnectionType.DirectConnection)
+        self.listener = Listener(address, family='AF_UNIX', authkey=self.authkey)
+        self._thread = None
+
+    def start(self):
+        """Start accepting panel connections and polling device"""
+
+        self.poller.start()
+        self._thread = Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop polling and close connection to panel"""
+
+        self._stop.set()
+        self.poller.stop()
+        self.commands.stop()
+        if self._connection is not None:
+            try:
+                self._send('close', None)
+            except (OSError, AttributeError):
+                pass
+        self.listener.close()
+
+    def launch_panel(self, widget: str = None):
+        """Start panel in a new process connected to this agent
+        :param widget: import path of BaseDeviceWidget subclass taking class and properties like module:Class
+        :return: process of panel"""
+
+        command = [sys.executable, '-m', __name__, self.address]
+        if widget is not None:
+            command += ['--widget', widget]
+        return subprocess.Popen(command, env={**os.environ, AUTHKEY_ENV_VAR: self.authkey.hex()})
+
+    def queue_diff(self, name: str, value):
+        """Add changed value to next batch sent to panel. Newer values of same property replace older ones. Called
+        from poller and command queue threads
+        :param name: name of property
+        :param value: new value of property"""
+
+        with self._diff_lock:
+            self._diff[name] = value
+
+    def snapshot(self):
+        """Read all properties of device to send when panel connects"""
+
+        properties = {}
+        for name in get_device_schema(type(self.device)).properties:
+            try:
+                with self.device_lock:
+                    value = getattr(self.device, name)
+            except Exception as e:
+                self.log.warning(f'reading {name} failed: {e}')
+                continue
+            if value is not None:
+                properties[name] = value
+        return properties
+
+    def _serve(self):
+        """Serve panels one at a time until stopped"""
+
+        while not self._stop.is_set():
+            try:
+                self._connection = connection = self.listener.accept()
+            except OSError:  # listener closed
+                return
+            device_class = type(self.device)
+            self._send('hello', {'module': device_class.__module__, 'class': device_class.__qualname__,
+                                 'properties': self.snapshot()})
+            sender = Thread(target=self._send_diffs, daemon=True)
+            sender.start()
+            self._receive()
+            self._connection = None
+            sender.join()
+            connection.close()
+
+    def _send(self, kind: str, payload):
+        """Send message to panel"""
+
+        with self._send_lock:
+            self._connection.send((kind, payload))
+            self.messages_sent += 1
+
+    def _send_diffs(self):
+        """Send batch of changed values every flush interval while panel is connected"""
+
+        while not self._stop.wait(self.flush_interval_ms / 1000) and self._connection is not None:
+            with self._diff_lock:
+                diff, self._diff = self._diff, {}
+            if diff:
+                try:
+                    self._send('diff', diff)
+                except (OSError, AttributeError):  # panel went away
+                    return
+
+    def _receive(self):
+        """Queue writes sent by panel until it disconnects"""
+
+        while True:
+            try:
+                kind, payload = self._connection.recv()
+            except (EOFError, OSError):
+                return
+            if kind == 'set':
+                for name, value in payload.items():
+                    self.commands.submit(name, value)
+            elif kind == 'close':
+                return
+
+
+class RemotePanelClient(QObject):
+    """Panel side of a remote panel. Applies batches of device values to widgets on the gui thread and sends edits
+    made in widgets to the agent in batches"""
+
+    diffReceived = Signal(dict)
+    disconnected = Signal()
+
+    def __init__(self, address: str, authkey: bytes, flush_interval_ms: float = 50):
+        """
+        :param address: path of unix socket agent listens on
+        :param authkey: key of agent
+        :param flush_interval_ms: how often edits are sent to agent"""
+
+        super().__init__()
+        self.log = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.connection = Client(address, family='AF_UNIX', authkey=authkey)
+        kind, hello = self.connection.recv()
+        self.properties = hello['properties']
+        try:
+            self.device_class = getattr(importlib.import_module(hello['module']), hello['class'])
+        except (ImportError, AttributeError):  # driver isn't importable in panel process so show values only
+            self.log.warning(f"couldn't import {hello['module']}.{hello['class']}")
+            self.device_class = None
+        self.widgets = []
+        self._outgoing = {}
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(int(flush_interval_ms))
+        self._flush_timer.timeout.connect(self.flush)
+        self.diffReceived.connect(self.apply_diff)  # queued since emitted by reader thread
+        self._reader = Thread(target=self._read, daemon=True)
+        self._reader.start()
+
+    def connect_widget(self, widget):
+        """Show device values in widget and send its edits to agent
+        :param widget: BaseDeviceWidget built from properties of client"""
+
+        self.widgets.append(widget)
+        # nested edits are written as the whole top level property. Copied since widget edits its dictionaries in place
+        widget.ValueChangedInside[str].connect(lambda name: self.submit(name.split('.')[0],
+                                                                        copy.deepcopy(getattr(widget,
+                                                                                              name.split('.')[0]))))
+
+    def submit(self, name: str, value):
+        """Queue write of property to be sent with next batch
+        :param name: name of property
+        :param value: value to write"""
+
+        self._outgoing[name] = value
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    @Slot()
+    def flush(self):
+        """Send queued writes to agent"""
+
+        outgoing, self._outgoing = self._outgoing, {}
+        if outgoing:
+            try:
+                self.connection.send(('set', outgoing))
+            except OSError as e:
+                self.log.error(f'sending writes failed: {e}')
+
+    @Slot(dict)
+    def apply_diff(self, diff: dict):
+        """Set values reported by device on connected widgets. Each widget gets its own copy since widgets edit nested
+        dictionaries in place
+        :param diff: dictionary of property names mapping to values"""
+
+        for widget in self.widgets:
+            for name, value in diff.items():
+                if name in widget._property_names:
+                    widget.set_from_device(name, copy.deepcopy(value))
+
+    def close(self):
+        """Send remaining writes and disconnect from agent"""
+
+        self.flush()
+        try:
+            self.connection.send(('close', None))
+        except OSError:
+            pass
+        self.connection.close()
+
+    def _read(self):
+        """Receive batches from agent until it disconnects"""
+
+        while True:
+            try:
+                kind, payload = self.connection.recv()
+            except (EOFError, OSError):
+                break
+            if kind == 'diff':
+                self.diffReceived.emit(payload)
+            elif kind == 'close':
+                break
+        self.disconnected.emit()
+
+
+def main():
+    from qtpy.QtWidgets import QApplication
+    from instrument_widgets.base_device_widget import BaseDeviceWidget
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('address', help='path of unix socket agent listens on')
+    parser.add_argument('--widget', help='BaseDeviceWidget subclass to show like module:Class')
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    authkey = bytes.fromhex(os.environ[AUTHKEY_ENV_VAR]) if AUTHKEY_ENV_VAR in os.environ else b''
+    client = RemotePanelClient(args.address, authkey)
+    widget_class = BaseDeviceWidget
+    if args.widget:
+        module, name = args.widget.split(':')
+        widget_class = getattr(importlib.import_module(module), name)
+    device = client.device_class if client.device_class is not None else dict(client.properties)
+    widget = widget_class(device, client.properties)
+    client.connect_widget(widget)
+    client.disconnected.connect(app.quit)
+    app.aboutToQuit.connect(client.close)
+    widget.show()
+    sys.exit(app.exec())
+
+
+if __name__ == "__main__":
+    main()
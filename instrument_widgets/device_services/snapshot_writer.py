@@ -0,0 +1,101 @@
+from qtpy.QtCore import QObject, Signal
+from threading import Thread
+from queue import Queue
+import logging
+import numpy
+from instrument_widgets.device_services.device_locks import get_device_lock
+
+
+def grab_single_frame(camera):
+    """Start camera for one frame, grab it and stop camera
+    :param camera: camera object with prepare, start, grab_frame and stop"""
+
+    with get_device_lock(camera):
+        camera.prepare()
+        camera.start(1)
+        try:
+            return camera.grab_frame()
+        finally:
+            camera.stop()
+
+
+class SnapshotWriter(QObject):
+    """Writes snapshots on a background thread so the gui isn't blocked while large frames reach disk. Snapshots
+    are written in the order they are submitted. Frames are copied into a memory mapped .npy or TIFF file in chunks so
+    progress can be reported"""
+
+    progress = Signal(str, float)  # path, fraction written
+    completed = Signal(str)
+    failed = Signal(str, object)
+    queueDepthChanged = Signal(int)
+
+    def __init__(self, chunk_bytes: int = 64 * 2**20):
+        """
+        :param chunk_bytes: about how many bytes are copied between progress reports"""
+
+        super().__init__()
+        self.log = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.chunk_bytes = chunk_bytes
+        self._queue = Queue()
+        self._worker = Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit(self, frame, path: str):
+        """Queue frame to be written. Returns immediately
+        :param frame: 2D array, or callable returning one on the writer thread like a camera grab
+        :param path: path ending in .npy, .tif or .tiff"""
+
+        self._queue.put((frame, str(path)))
+        self.queueDepthChanged.emit(self._queue.qsize())
+
+    def capture(self, camera, path: str):
+        """Queue grabbing a single frame from a camera that isn't running and writing it
+        :param camera: camera object with prepare, start, grab_frame and stop
+        :param path: path ending in .npy, .tif or .tiff"""
+
+        self.submit(lambda: grab_single_frame(camera), path)
+
+    def depth(self):
+        """Number of snapshots waiting to be written"""
+
+        return self._queue.qsize()
+
+    def stop(self):
+        """Write queued snapshots and stop writer thread"""
+
+        self._queue.put(None)
+        self._worker.join()
+
+    def _run(self):
+        """Write snapshots until stopped"""
+
+        while (job := self._queue.get()) is not None:
+            frame, path = job
+            try:
+                self.write(frame() if callable(frame) else frame, path)
+            except Exception as e:
+                self.log.error(f'writing snapshot {path} failed: {e}')
+                self.failed.emit(path, e)
+            else:
+                self.completed.emit(path)
+            self.queueDepthChanged.emit(self._queue.qsize())
+
+    def write(self, frame, path: str):
+        """Copy frame into memory mapped file in chunks of rows
+        :param frame: 2D array
+        :param path: path ending in .npy, .tif or .tiff"""
+
+        if path.lower().endswith(('.tif', '.tiff')):
+            try:
+                import tifffile
+            except ImportError:
+                raise RuntimeError('tifffile must be installed to write TIFF snapshots')
+            output = tifffile.memmap(path, shape=frame.shape, dtype=frame.dtype)
+        else:
+            output = numpy.lib.format.open_memmap(path, mode='w+', dtype=frame.dtype, shape=frame.shape)
+        rows = max(1, self.chunk_bytes // max(1, frame[0].nbytes))
+        for start in range(0, frame.shape[0], rows):
+            output[start:start + rows] = frame[start:start + rows]
+            self.progress.emit(path, min(start + rows, frame.shape[0]) / frame.shape[0])
+        output.flush()
+        del output
@@ -0,0 +1,89 @@
+from qtpy.QtCore import QObject, Signal, Slot, QTimer
+from threading import Lock
+import logging
+
+
+class DeviceUpdateBridge(QObject):
+    """Bounded queue device threads push (name, value) updates into instead of setting widget attributes directly,
+    which isn't safe off the gui thread. Updates are coalesced as they are pushed so only the latest value of each
+    property is held, and are drained on the gui thread at a fixed interval. A burst of updates to one property never
+    fills the queue, and updates are only dropped and counted when too many distinct properties are waiting. The
+    final value of every property that was admitted is always delivered.
+
+    bridge = DeviceUpdateBridge(widget)
+    bridge.start()
+    # in device thread
+    bridge.push('frame_count', frame_count)"""
+
+    updatesDropped = Signal(int)  # total number of dropped updates, emitted on drain when it has grown
+
+    def __init__(self, widget=None, maxsize: int = 10000, interval_ms: int = 16):
+        """
+        :param widget: optional BaseDeviceWidget whose set_from_device receives updates
+        :param maxsize: most distinct properties held between drains
+        :param interval_ms: how often queue is drained"""
+
+        super().__init__()
+        self.log = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.maxsize = maxsize
+        self.dropped = 0
+        self.coalesced = 0  # updates replaced by a newer value of same property before being drained
+        self.delivered = 0
+        self.widgets = []
+        self._reported_dropped = 0
+        self._queue = {}  # property names mapping to latest value, in order of first update since last drain
+        self._lock = Lock()
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.drain)
+        if widget is not None:
+            self.connect_widget(widget)
+
+    def connect_widget(self, widget):
+        """Deliver updates to widget
+        :param widget: BaseDeviceWidget to receive updates"""
+
+        self.widgets.append(widget)
+
+    def start(self):
+        """Start draining queue. Call from gui thread"""
+
+        self._timer.start()
+
+    def stop(self):
+        """Stop draining queue and deliver what is left"""
+
+        self._timer.stop()
+        self.drain()
+
+    def push(self, name: str, value):
+        """Queue update from any thread. Never blocks
+        :param name: name of property
+        :param value: new value of property
+        :return: False if update was dropped since queue was full of other properties"""
+
+        with self._lock:
+            if name in self._queue:
+                self.coalesced += 1
+            elif len(self._queue) >= self.maxsize:
+                self.dropped += 1
+                return False
+            self._queue[name] = value
+        return True
+
+    @Slot()
+    def drain(self):
+        """Apply queued updates to widgets. Runs on gui thread"""
+
+        with self._lock:
+            latest, self._queue = self._queue, {}
+            dropped = self.dropped
+        for widget in self.widgets:
+            for name, value in latest.items():
+                widget.set_from_device(name, value)
+        self.delivered += len(latest)
+        if dropped != self._reported_dropped:
+            self.log.warning(f'{dropped - self._reported_dropped} updates dropped since queue was full of other '
+                             f'properties')
+            self._reported_dropped = dropped
+            self.updatesDropped.emit(dropped)
@@ -1,8 +1,24 @@
-from instrument_widgets.base_device_widget import BaseDeviceWidget, create_widget, scan_for_properties
-from qtpy.QtWidgets import QPushButton, QStyle
+from instrument_widgets.base_device_widget import BaseDeviceWidget, create_widget, scan_for_properties, PendingProperty
+from instrument_widgets.widget_profiler import profiled
+from instrument_widgets.device_services.live_view import LiveView
+from instrument_widgets.device_services.snapshot_writer import SnapshotWriter
+from instrument_widgets.device_services.acquisition_monitor import AcquisitionMonitor
+from instrument_widgets.miscellaneous_widgets.q_acquisition_dashboard import QAcquisitionDashboard
+from qtpy.QtWidgets import QPushButton, QStyle, QLabel
+from qtpy.QtCore import Slot
+from datetime import datetime
+from pathlib import Path
 
 
 class CameraWidget(BaseDeviceWidget):
+    live_display_hz = 30  # most live frames shown per second, independent of camera frame rate
+    live_frame_count = 2**31 - 1  # frames camera is started for when live
+    live_display_px = 2048  # live frames are reduced to about this many pixels along each side before display
+    live_downsample_method = 'stride'  # 'stride' or 'mean' binning of live frames
+    snapshot_directory = '.'  # folder snapshots are written to
+    snapshot_format = 'npy'  # 'npy' or 'tiff'. tiff needs tifffile
+    acquisition_state_hz = 2  # acquisition states read per second while dashboard is shown
+    acquisition_history = 240  # number of acquisition states plotted
 
     def __init__(self, camera,
                  advanced_user: bool = True):
@@ -10,8 +26,13 @@ class CameraWidget(BaseDeviceWidget):
         live view button, and snapshot button.
         :param camera: camera object"""
 
-        self.camera_properties = scan_for_properties(camera) if advanced_user else {}
+        self.camera_properties = scan_for_properties(camera, self.scan_timeout_s) if advanced_user else {}
         super().__init__(type(camera), self.camera_properties)
+        self.camera = camera
+        self.live_view = None  # created when live is first started
+        self.snapshot_writer = None  # created when first snapshot is taken
+        self.acquisition_monitor = None  # created when dashboard is first shown
+        self.acquisition_dashboard = None
 
         # TODO: Automatically set up validators for properties with min max values
         self.validator_attributes = {k: v for k, v in camera.__dict__.items() if 'min_' in k or
@@ -19,30 +40,178 @@ class CameraWidget(BaseDeviceWidget):
         self.add_roi_validator()
         self.add_live_button()
         self.add_snapshot_button()
+        if hasattr(camera, 'get_camera_acquisition_state'):
+            self.add_dashboard_button()
 
+    @profiled('add_live_button', count_objects=True)
     def add_live_button(self):
         """Add live button"""
 
         button = QPushButton('Live')
         icon = self.style().standardIcon(QStyle.StandardPixmap.SP_MediaPlay)
         button.setIcon(icon)
+        button.setCheckable(True)
+        button.toggled.connect(self.toggle_live)
+        counts = QLabel()
         widget = self.centralWidget()
-        self.setCentralWidget(create_widget('V', button, widget))
+        self.setCentralWidget(create_widget('V', create_widget('H', button, counts), widget))
         setattr(self, 'live_button', button)
+        setattr(self, 'live_counts_label', counts)
+
+    def create_live_view(self):
+        """Create live view of camera showing frames in separate image view window"""
+
+        live_view = LiveView(self.camera, display_hz=self.live_display_hz, frame_count=self.live_frame_count,
+                             display_px=self.live_display_px, downsample_method=self.live_downsample_method)
+        live_view.image_view.setWindowTitle(f'{getattr(self.camera, "id", "camera")} live')
+        live_view.countsChanged.connect(lambda grabbed, displayed:
+                                        self.live_counts_label.setText(f'displayed {displayed} / grabbed {grabbed}'))
+        live_view.stopped.connect(self.live_stopped)  # queued since emitted by worker thread
+        return live_view
+
+    @Slot(bool)
+    def toggle_live(self, checked):
+        """Start or stop live view
+        :param checked: if live button is checked"""
+
+        if self.live_view is None:
+            self.live_view = self.create_live_view()
+        icon = QStyle.StandardPixmap.SP_MediaStop if checked else QStyle.StandardPixmap.SP_MediaPlay
+        self.live_button.setIcon(self.style().standardIcon(icon))
+        if checked:
+            self.live_view.image_view.show()
+            if not self.live_view.start():
+                self.log.warning('camera is still stopping from last live view')
+                self.live_button.setChecked(False)
+        else:
+            self.live_view.stop()
+
+    @Slot()
+    def live_stopped(self):
+        """Uncheck live button if live view stopped on its own like after an error"""
+
+        if self.live_button.isChecked() and not self.live_view.is_running():
+            self.live_button.setChecked(False)
 
+    @profiled('add_snapshot_button', count_objects=True)
     def add_snapshot_button(self):
         """Add snapshot button"""
 
         button = QPushButton('Snapshot')
         # icon = self.style().standardIcon(QStyle.StandardPixmap.SP_MediaPlay)
         # button.setIcon(icon)
+        button.clicked.connect(self.take_snapshot)
+        status = QLabel()
         widget = self.centralWidget()
-        self.setCentralWidget(create_widget('V', button, widget))
+        self.setCentralWidget(create_widget('V', create_widget('H', button, status), widget))
         setattr(self, 'snapshot_button', button)
+        setattr(self, 'snapshot_status_label', status)
+
+    @Slot()
+    def take_snapshot(self):
+        """Write newest live frame, or grab a frame if not live, to file in background. Returns immediately. If live
+        view hasn't delivered its first frame yet, writer waits for it. Camera is never restarted while live view
+        still has it started"""
+
+        if self.snapshot_writer is None:
+            self.snapshot_writer = SnapshotWriter()
+            # queued since emitted by writer thread
+            self.snapshot_writer.progress.connect(self.snapshot_progress)
+            self.snapshot_writer.completed.connect(self.snapshot_completed)
+            self.snapshot_writer.failed.connect(self.snapshot_failed)
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        path = Path(self.snapshot_directory, f'{getattr(self.camera, "id", "camera")}_snapshot_{timestamp}.'
+                                             f'{self.snapshot_format}')
+        if self.live_view is not None and self.live_view.is_streaming():
+            # take frame from live view instead of restarting camera it streams from, also while it is still stopping.
+            # Copied since cameras may reuse frame buffers
+            live_view = self.live_view
+            frame = live_view.full_frame
+            self.snapshot_writer.submit(frame.copy() if frame is not None
+                                        else lambda: live_view.wait_for_frame().copy(), path)
+        else:
+            self.snapshot_writer.capture(self.camera, path)
+        self.snapshot_status_label.setText(f'{self.snapshot_writer.depth()} snapshot(s) queued')
+
+    @Slot(str, float)
+    def snapshot_progress(self, path, fraction):
+        """Show how much of snapshot has been written"""
+
+        self.snapshot_status_label.setText(f'writing {Path(path).name}: {fraction:.0%}')
+
+    @Slot(str)
+    def snapshot_completed(self, path):
+        """Show where snapshot was written"""
+
+        self.snapshot_status_label.setText(f'saved {Path(path).name}')
+
+    @Slot(str, object)
+    def snapshot_failed(self, path, error):
+        """Show that snapshot couldn't be written"""
+
+        self.snapshot_status_label.setText(f'failed {Path(path).name}: {error}')
+
+    @profiled('add_dashboard_button', count_objects=True)
+    def add_dashboard_button(self):
+        """Add button showing acquisition state dashboard"""
+
+        button = QPushButton('Acquisition state')
+        button.setCheckable(True)
+        button.toggled.connect(self.toggle_dashboard)
+        widget = self.centralWidget()
+        self.setCentralWidget(create_widget('V', button, widget))
+        setattr(self, 'dashboard_button', button)
+
+    def create_acquisition_dashboard(self):
+        """Create monitor of camera acquisition state and dashboard plotting it in separate window"""
+
+        self.acquisition_monitor = AcquisitionMonitor(self.camera, rate_hz=self.acquisition_state_hz)
+        self.acquisition_dashboard = QAcquisitionDashboard(self.acquisition_history,
+                                                           self.acquisition_monitor.buffer_size)
+        self.acquisition_dashboard.setWindowTitle(f'{getattr(self.camera, "id", "camera")} acquisition state')
+        # queued since emitted by monitor thread
+        self.acquisition_monitor.stateSampled.connect(self.acquisition_dashboard.append)
+        self.acquisition_monitor.alarmChanged.connect(self.acquisition_alarm_changed)
+
+    @Slot(bool)
+    def toggle_dashboard(self, checked):
+        """Show dashboard and poll acquisition state, or hide dashboard and stop polling
+        :param checked: if dashboard button is checked"""
+
+        if self.acquisition_dashboard is None:
+            self.create_acquisition_dashboard()
+        if checked:
+            self.acquisition_dashboard.clear()
+            self.acquisition_dashboard.show()
+            self.acquisition_monitor.start()
+        else:
+            self.acquisition_monitor.stop()
+            self.acquisition_dashboard.hide()
+
+    @Slot(bool, str)
+    def acquisition_alarm_changed(self, raised, reason):
+        """Show alarm on dashboard and dashboard button so it's seen while dashboard is hidden behind other windows
+        :param raised: if alarm is raised
+        :param reason: text describing alarm"""
+
+        self.acquisition_dashboard.set_alarm(raised, reason)
+        self.dashboard_button.setStyleSheet('background-color: #d62728; color: white;' if raised else '')
+        self.dashboard_button.setToolTip(reason)
+        if raised:
+            self.log.warning(f'acquisition alarm: {reason}')
+
+    def fill_pending_property(self, name, future):
+        """Add roi validator once roi has been read"""
+
+        super().fill_pending_property(name, future)
+        if name == 'roi' and 'roi' in self.property_widgets:
+            self.camera_properties['roi'] = self.roi
+            self.add_roi_validator()
 
+    @profiled('add_roi_validator', count_objects=True)
     def add_roi_validator(self):
         """Add checks on inputs to roi widgets"""
-        if 'roi' in self.camera_properties.keys():
+        if 'roi' in self.camera_properties.keys() and not isinstance(self.camera_properties['roi'], PendingProperty):
             for k in self.camera_properties['roi'].keys():
                 getattr(self, f'roi.{k}_widget').disconnect()  # Disconnect all calls
                 getattr(self, f'roi.{k}_widget').editingFinished.connect(lambda key=k: self.roi_validator(key))
@@ -62,7 +231,7 @@ class CameraWidget(BaseDeviceWidget):
             value = specs['max']
         elif value % specs['divisor'] != 0:
             value = round(value / specs['divisor']) * specs['divisor']
-        getattr(self, 'roi').__setitem__(k, value)
+        self.set_from_widget(f'roi.{k}', value)
         widget.setText(str(value))
         self.ValueChangedInside.emit(f'roi.{k}')
         widget.blockSignals(False)
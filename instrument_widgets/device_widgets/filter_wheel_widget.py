@@ -3,7 +3,7 @@ from qtpy.QtWidgets import QGraphicsEllipseItem
 from qtpy.QtCore import Signal, QTimer, Property, QObject, Slot
 from math import sin, cos, pi, atan, degrees, radians
 from qtpy.QtGui import QFont
-from instrument_widgets.base_device_widget import BaseDeviceWidget, scan_for_properties
+from instrument_widgets.base_device_widget import BaseDeviceWidget, scan_for_properties, PendingProperty
 
 setConfigOptions(antialias=True)
 
@@ -13,29 +13,46 @@ class FilterWheelWidget(BaseDeviceWidget):
         """Simple scroll widget for filter wheel
         :param filter_wheel: filter wheel device"""
 
-        properties = scan_for_properties(filter_wheel)
+        properties = scan_for_properties(filter_wheel, self.scan_timeout_s)
         super().__init__(type(filter_wheel), properties)
+        self.filter_wheel = filter_wheel
+        self.advanced_user = advanced_user
+
+        # Create wheel widget and connect to signals
+        self.wheel_widget = FilterWheelGraph(list(filter_wheel.filters.keys()))
+        self.ValueChangedOutside[str].connect(lambda name: self.wheel_widget.set_index(getattr(self, name)))
+        self.centralWidget().layout().addWidget(self.wheel_widget)
+        if not advanced_user:
+            self.wheel_widget.setDisabled(True)
+
+        if not isinstance(properties.get('filter'), PendingProperty):  # otherwise added once filter has been read
+            self.add_filter_combo_box()
+
+    def add_filter_combo_box(self):
+        """Replace filter widget with combo box of filters linked to wheel widget"""
 
         # Remove filter widget
         self.centralWidget().layout().removeWidget(self.filter_widget)
         self.filter_widget.deleteLater()
         # recreate as combo box with filters as options
-        self.filter_widget = self.create_combo_box('filter', filter_wheel.filters)
-        self.filter_widget.setCurrentText(str(filter_wheel.filter))
+        self.filter_widget = self.create_combo_box('filter', self.filter_wheel.filters)
+        self.filter_widget.setCurrentText(str(self.filter))
         # Add back to property widget
         self.property_widgets['filter'].layout().addWidget(self.filter_widget)
 
-        # Create wheel widget and connect to signals
-        wheel_widget = FilterWheelGraph(list(filter_wheel.filters.keys()))
-        wheel_widget.ValueChangedInside[str].connect(lambda value: self.filter_widget.setCurrentText(str(value)))
-        self.filter_widget.currentTextChanged.connect(lambda value: wheel_widget.set_index(value))
-        self.ValueChangedOutside[str].connect(lambda name: wheel_widget.set_index(getattr(self, name)))
-        self.centralWidget().layout().addWidget(wheel_widget)
+        self.wheel_widget.ValueChangedInside[str].connect(lambda value: self.filter_widget.setCurrentText(str(value)))
+        self.filter_widget.currentTextChanged.connect(lambda value: self.wheel_widget.set_index(value))
 
-        if not advanced_user:
-            wheel_widget.setDisabled(True)
+        if not self.advanced_user:
             self.filter_widget.setDisabled(True)
 
+    def fill_pending_property(self, name, future):
+        """Add filter combo box once filter has been read"""
+
+        super().fill_pending_property(name, future)
+        if name == 'filter' and 'filter' in self.property_widgets:
+            self.add_filter_combo_box()
+
 class FilterWheelGraph(PlotWidget):
     ValueChangedInside = Signal((str,))
 
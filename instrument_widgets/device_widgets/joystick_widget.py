@@ -1,4 +1,6 @@
-from instrument_widgets.base_device_widget import BaseDeviceWidget, create_widget, label_maker, scan_for_properties
+from instrument_widgets.base_device_widget import BaseDeviceWidget, create_widget, label_maker, scan_for_properties, \
+    PendingProperty
+from instrument_widgets.widget_profiler import profiled
 from qtpy.QtWidgets import QLabel
 
 
@@ -9,12 +11,21 @@ class JoystickWidget(BaseDeviceWidget):
         """Modify BaseDeviceWidget to be specifically for Joystick.
         :param joystic: joystick object"""
 
-        properties = scan_for_properties(joystick) if advanced_user else {}
+        properties = scan_for_properties(joystick, self.scan_timeout_s) if advanced_user else {}
         super().__init__(type(joystick), properties)
-        if advanced_user:
+        if advanced_user and not any(isinstance(properties.get(k), PendingProperty)
+                                     for k in ['joystick_mapping', 'stage_axes']):
             self.create_axis_combo_box()
 
+    def fill_pending_property(self, name, future):
+        """Create axis combo boxes once joystick mapping and stage axes have been read"""
 
+        super().fill_pending_property(name, future)
+        if name in ['joystick_mapping', 'stage_axes'] and \
+                all(k in self._property_names for k in ['joystick_mapping', 'stage_axes']):
+            self.create_axis_combo_box()
+
+    @profiled('create_axis_combo_box', count_objects=True)
     def create_axis_combo_box(self):
         """Transform Instrument Axis text box into combo box and allow selection of only available axes"""
 
@@ -1,4 +1,5 @@
-from instrument_widgets.base_device_widget import BaseDeviceWidget, create_widget, scan_for_properties
+from instrument_widgets.base_device_widget import BaseDeviceWidget, create_widget, scan_for_properties, PendingProperty
+from instrument_widgets.widget_profiler import profiled
 from qtpy.QtCore import Qt
 import importlib
 from instrument_widgets.miscellaneous_widgets.q_scrollable_float_slider import QScrollableFloatSlider
@@ -13,17 +14,30 @@ class LaserWidget(BaseDeviceWidget):
         :param laser: laser object
         :param color: color of laser slider"""
 
-        self.laser_properties = scan_for_properties(laser) if advanced_user else \
+        self.laser_properties = scan_for_properties(laser, self.scan_timeout_s) if advanced_user else \
             {'power_setpoint_mw':laser.power_setpoint_mw}
         self.laser_module = importlib.import_module(laser.__module__)
         self.slider_color = color
         super().__init__(type(laser), self.laser_properties)
         self.max_power_mw = laser.max_power_mw
-        self.add_power_slider()
+        if not isinstance(self.laser_properties['power_setpoint_mw'], PendingProperty):
+            self.add_power_slider()
 
+    def fill_pending_property(self, name, future):
+        """Add power slider once power setpoint has been read"""
+
+        super().fill_pending_property(name, future)
+        if name == 'power_setpoint_mw' and name in self._property_names:
+            self.add_power_slider()
+
+    @profiled('add_power_slider', count_objects=True)
     def add_power_slider(self):
         """Redo power widget to be slider"""
 
+        if self.property_backend == 'model':  # tree view edits power with slider created for edited row
+            decimals = 2 if isinstance(self.power_setpoint_mw, float) else 0
+            self.property_model.set_slider('power_setpoint_mw', 0, self.max_power_mw, decimals)
+            return
         textbox = self.power_setpoint_mw_widget
         if type(textbox.validator()) == QDoubleValidator:
             textbox.validator().setRange(0.0, self.max_power_mw, decimals=2)  # Todo: how to handle minimum power?
@@ -43,7 +57,7 @@ class LaserWidget(BaseDeviceWidget):
         slider.setMaximum(int(self.max_power_mw))
         slider.setValue(int(self.power_setpoint_mw))
         slider.sliderMoved.connect(lambda value: textbox.setText(str(value)))
-        slider.sliderMoved.connect(lambda: setattr(self, 'power_setpoint_mw', float(slider.value())))
+        slider.sliderMoved.connect(lambda: self.set_from_widget('power_setpoint_mw', float(slider.value())))
         slider.sliderMoved.connect(lambda: self.ValueChangedInside.emit('power_setpoint_mw'))
 
         self.power_setpoint_mw_widget_slider = slider
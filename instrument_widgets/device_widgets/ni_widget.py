@@ -4,13 +4,16 @@ from qtpy.QtCore import Qt
 import qtpy.QtGui as QtGui
 from instrument_widgets.miscellaneous_widgets.q_scrollable_float_slider import QScrollableFloatSlider
 from instrument_widgets.device_widgets.waveform_widget import WaveformWidget
+from instrument_widgets.widget_profiler import profiled
 import numpy as np
 from scipy import signal
 from qtpy.QtCore import Slot
 from random import randint
+import ruamel.yaml
 
 
 class NIWidget(BaseDeviceWidget):
+    lazy_nested_widgets = True  # widgets of ports and channels are built when their tree item is first expanded
 
     def __init__(self, daq,
                  exposed_branches: dict = None,
@@ -42,6 +45,7 @@ class NIWidget(BaseDeviceWidget):
 
         # create tree widget and format configured widgets into tree
         self.tree = QTreeWidget()
+        self.tree.itemExpanded.connect(self.build_tree_item_widgets)
         for tasks, widgets in self.exposed_branches.items():
             header = QTreeWidgetItem(self.tree,
                                      [label_maker(tasks.split('.')[-1])])  # take last of list incase key is a map
@@ -59,8 +63,11 @@ class NIWidget(BaseDeviceWidget):
             graph_parent.addChild(graph_child)
 
         self.setCentralWidget(self.tree)
-        self.tree.expandAll()
+        for i in range(self.tree.topLevelItemCount()):  # deeper items are expanded, and built, by user
+            self.tree.topLevelItem(i).setExpanded(True)
+            self.build_tree_item_widgets(self.tree.topLevelItem(i))
 
+    @profiled('update_waveform')
     def update_waveform(self, channel_name):
         """Add waveforms to waveform widget"""
 
@@ -135,15 +142,12 @@ class NIWidget(BaseDeviceWidget):
     def waveform_value_changed(self, value, name):
         """Update textbox if waveform is changed"""
 
-        name_lst = name.split('.')
         textbox = getattr(self, f'{name}_widget')
         slider = getattr(self, f'{name}_slider')
         value = round(value, 0) if 'time' in name else round(value, 3)
         textbox.setText(str(value))
         slider.setValue(value)
-        dictionary = pathGet(self.__dict__, name_lst[0:-1])
-        dictionary.__setitem__(name_lst[-1], value)
-        setattr(self, name, value)
+        self.set_from_widget(name, value)
         self.ValueChangedInside.emit(name)
 
     def remodel_timing_widgets(self, name, widget):
@@ -204,14 +208,13 @@ class NIWidget(BaseDeviceWidget):
             textbox.editingFinished.connect(lambda: self.update_waveform(name))
 
             slider.sliderMoved.connect(lambda value: textbox.setText(str(value)))
-            slider.sliderMoved.connect(lambda value: setattr(self, name, float(value)))
-            slider.sliderMoved.connect(lambda value:
-                                       pathGet(self.__dict__, path[0:-1]).__setitem__(path[-1], value))
+            slider.sliderMoved.connect(lambda value: self.set_from_widget(name, float(value)))
             slider.sliderMoved.connect(lambda: self.ValueChangedInside.emit(name))
             slider.sliderMoved.connect(lambda: self.update_waveform(name))
 
         setattr(self, f'{name}_slider', slider)
 
+    @profiled('create_tree_widget', count_objects=True)
     def create_tree_widget(self, name, parent=None):
         """Recursive function to format nested dictionary of ni task items"""
 
@@ -221,25 +224,48 @@ class NIWidget(BaseDeviceWidget):
         items = []
         for key, value in dictionary.items():
             id = f'{name}.{key}'
-            if widget := getattr(self, f'{id}_widget', False):
-                item = QTreeWidgetItem(parent, [key])
+            item = QTreeWidgetItem(parent, [key])
+            if self.is_tree_leaf(id):
                 if 'channel' in name:
-                    self.update_waveform(id)
-                    self.create_sliders(id)
-                    widget = create_widget('H', getattr(self, f'{id}_widget'), getattr(self, f'{id}_slider'))
-                elif 'timing' in name:
-                    widget = self.remodel_timing_widgets(id, widget)
-                elif key in ['port', 'waveform']:
-                    widget = self.remodel_port_widgets(id, widget)
-                self.tree.setItemWidget(item, 1, widget)
+                    self.update_waveform(id)  # waveform is drawn from values so all channels show before building
+                item.setData(0, Qt.ItemDataRole.UserRole, id)  # widget is added when parent is expanded
             else:
-                item = QTreeWidgetItem(parent, [key])
                 children = self.create_tree_widget(f'{name}.{key}', item)
                 item.addChildren(children)
             items.append(item)
             self.check_to_hide(id, item)
         return items
 
+    def is_tree_leaf(self, name):
+        """If property has a widget of its own rather than children in tree. Checked without building lazy widgets
+        :param name: dotted name of property"""
+
+        if f'{name}_widget' in self.__dict__:
+            return True
+        return name in self._property_names and type(getattr(self, name)) not in [dict, ruamel.yaml.comments.CommentedMap]
+
+    @Slot(QTreeWidgetItem)
+    def build_tree_item_widgets(self, parent):
+        """Add widgets of leaves under expanded tree item that haven't been built yet
+        :param parent: expanded tree item"""
+
+        for i in range(parent.childCount()):
+            item = parent.child(i)
+            if (id := item.data(0, Qt.ItemDataRole.UserRole)) is None:
+                continue
+            item.setData(0, Qt.ItemDataRole.UserRole, None)
+            if not (widget := getattr(self, f'{id}_widget', False)):  # builds lazy group holding widget
+                continue
+            name, key = id.rsplit('.', 1)
+            if 'channel' in name:
+                self.create_sliders(id)
+                widget = create_widget('H', widget, getattr(self, f'{id}_slider'))
+            elif 'timing' in name:
+                widget = self.remodel_timing_widgets(id, widget)
+            elif key in ['port', 'waveform']:
+                widget = self.remodel_port_widgets(id, widget)
+            self.tree.setItemWidget(item, 1, widget)
+
     def mappedpathGet(self, dictionary, path):
 
         # TODO: This is haaaaaacky. but might be good for now
@@ -288,8 +314,7 @@ class NIWidget(BaseDeviceWidget):
         textbox.setText(str(value))
         slider.setValue(float(value))
         self.ValueChangedInside.emit(name)
-        setattr(self, name, value)
-        pathGet(self.__dict__, name_lst[0:-1]).__setitem__(name_lst[-1], value)
+        self.set_from_widget(name, value)
         self.update_waveform(name)
 
     def textbox_fixup(self, value, name):
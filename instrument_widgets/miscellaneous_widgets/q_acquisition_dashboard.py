@@ -0,0 +1,69 @@
+from qtpy.QtWidgets import QWidget, QVBoxLayout, QLabel
+from qtpy.QtCore import Qt
+from pyqtgraph import PlotWidget, mkPen
+import numpy
+from instrument_widgets.ring_buffer import RingBuffer
+
+# key of acquisition state, plot title and line color
+PLOTS = [('frame_rate', 'frame rate [fps]', '#1f77b4'),
+         ('data_rate', 'data rate [MB/s]', '#2ca02c'),
+         ('dropped_frames', 'dropped frames', '#d62728'),
+         ('in_buffer_size', 'buffer occupancy [frames]', '#ff7f0e')]
+
+
+class QAcquisitionDashboard(QWidget):
+    """Plots of recent camera acquisition states with a status line that turns red while an alarm is raised. Each
+    plotted value keeps a fixed size history so memory doesn't grow over long runs"""
+
+    def __init__(self, capacity: int = 240, buffer_size: int = None, parent=None):
+        """
+        :param capacity: number of states shown
+        :param buffer_size: frames input buffer holds. Drawn as a line on occupancy plot if given"""
+
+        super().__init__(parent)
+        self.setLayout(QVBoxLayout())
+        self.alarm = False
+        self.status_label = QLabel('no acquisition')
+        self.layout().addWidget(self.status_label)
+        self.histories = {}
+        self.curves = {}
+        self.plots = {}
+        for key, title, color in PLOTS:
+            plot = PlotWidget(title=title)
+            plot.setMinimumHeight(100)
+            plot.setMouseEnabled(x=False, y=False)
+            self.histories[key] = RingBuffer(capacity)
+            self.curves[key] = plot.plot(pen=mkPen(color=color, width=2))
+            self.plots[key] = plot
+            self.layout().addWidget(plot)
+        if buffer_size:
+            self.plots['in_buffer_size'].addLine(y=buffer_size, pen=mkPen(color='#d62728', style=Qt.PenStyle.DashLine))
+            self.plots['in_buffer_size'].setYRange(0, buffer_size)
+
+    def append(self, state: dict):
+        """Add acquisition state to plots
+        :param state: dictionary returned by get_camera_acquisition_state"""
+
+        for key, history in self.histories.items():
+            value = state.get(key)
+            history.append(numpy.nan if value is None else value)
+            self.curves[key].setData(history.values(), connect='finite')
+        if not self.alarm:
+            self.status_label.setText(f"{state.get('frame_rate', 0):.1f} fps, {state.get('data_rate', 0):.1f} MB/s")
+
+    def set_alarm(self, raised: bool, reason: str = ''):
+        """Show or clear alarm
+        :param raised: if alarm is raised
+        :param reason: text describing alarm"""
+
+        self.alarm = raised
+        self.status_label.setStyleSheet('background-color: #d62728; color: white;' if raised else '')
+        self.status_label.setText(reason if raised else 'acquisition ok')
+
+    def clear(self):
+        """Remove plotted states and alarm"""
+
+        for key, history in self.histories.items():
+            history.clear()
+            self.curves[key].setData([])
+        self.set_alarm(False)
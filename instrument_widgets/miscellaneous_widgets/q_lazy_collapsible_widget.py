@@ -0,0 +1,59 @@
+from qtpy.QtWidgets import QWidget, QToolButton, QVBoxLayout
+from qtpy.QtCore import Qt
+
+
+class QLazyCollapsibleWidget(QWidget):
+    """Collapsible widget whose contents are only built the first time they are expanded or shown"""
+
+    def __init__(self, title: str, builder, expanded: bool = False, parent=None):
+        """
+        :param title: text of header button
+        :param builder: callable returning widget of contents
+        :param expanded: if contents are initially shown"""
+
+        super().__init__(parent)
+        self.builder = builder
+        self.content = None
+
+        self.toggle_button = QToolButton()
+        self.toggle_button.setText(title)
+        self.toggle_button.setCheckable(True)
+        self.toggle_button.setChecked(expanded)
+        self.toggle_button.setStyleSheet('QToolButton { border: none; }')
+        self.toggle_button.setToolButtonStyle(Qt.ToolButtonStyle.ToolButtonTextBesideIcon)
+        self.toggle_button.setArrowType(Qt.ArrowType.DownArrow if expanded else Qt.ArrowType.RightArrow)
+        self.toggle_button.toggled.connect(self.set_expanded)
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.toggle_button)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(layout)
+
+    def materialize(self):
+        """Build contents if they haven't been built yet"""
+
+        if self.content is None:
+            self.content = self.builder()
+            self.layout().addWidget(self.content)
+            self.content.setVisible(self.toggle_button.isChecked())
+        return self.content
+
+    def set_expanded(self, expanded: bool):
+        """Show or hide contents, building them if needed
+        :param expanded: if contents are shown"""
+
+        self.toggle_button.blockSignals(True)
+        self.toggle_button.setChecked(expanded)
+        self.toggle_button.blockSignals(False)
+        self.toggle_button.setArrowType(Qt.ArrowType.DownArrow if expanded else Qt.ArrowType.RightArrow)
+        if expanded:
+            self.materialize()
+        if self.content is not None:
+            self.content.setVisible(expanded)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self.isEnabled():  # disabled header can't be toggled so show contents
+            self.set_expanded(True)
+        elif self.toggle_button.isChecked():
+            self.materialize()
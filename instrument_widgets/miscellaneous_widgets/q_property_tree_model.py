@@ -0,0 +1,245 @@
+from qtpy.QtCore import QAbstractItemModel, QModelIndex, Qt
+from qtpy.QtWidgets import QStyledItemDelegate, QComboBox
+from qtpy.QtGui import QIntValidator, QDoubleValidator
+import ruamel.yaml
+from instrument_widgets.miscellaneous_widgets.q_scrollable_line_edit import QScrollableLineEdit
+from instrument_widgets.miscellaneous_widgets.q_scrollable_float_slider import QScrollableFloatSlider
+
+
+class PropertyNode:
+    """Row of property tree. Values aren't stored but read from widget so widget stays the only copy"""
+
+    def __init__(self, name: str, key: str, parent=None, editor: tuple = ('text', None), editable: bool = True):
+        """
+        :param name: dotted name of property
+        :param key: last key of name shown as label
+        :param parent: parent node
+        :param editor: type of editor and its input like ('combo', options) or ('slider', (minimum, maximum))
+        :param editable: if value can be edited"""
+
+        self.name = name
+        self.key = key
+        self.parent = parent
+        self.editor = editor
+        self.editable = editable
+        self.children = []
+        self.row = 0
+
+    def add_child(self, node):
+        node.row = len(self.children)
+        self.children.append(node)
+
+
+class QPropertyTreeModel(QAbstractItemModel):
+    """Item model over the properties of a BaseDeviceWidget. Edits are written through the widget's set_from_widget
+    and emit ValueChangedInside, so listeners see the same signals as with one input widget per property"""
+
+    columns = ['Property', 'Value']
+
+    def __init__(self, owner, names: list):
+        """
+        :param owner: BaseDeviceWidget whose properties are shown
+        :param names: top level property names to show"""
+
+        super().__init__()
+        self.owner = owner
+        self.root = PropertyNode('', '')
+        self.nodes = {}
+        for name in names:
+            self._add_node(name, self.root)
+
+    def _add_node(self, name: str, parent: PropertyNode, editor: tuple = None, editable: bool = None):
+        """Create node of property and nodes of its nested keys"""
+
+        value = getattr(self.owner, name)
+        if editor is None:  # top level property
+            editor = self.owner.find_input_specs(name, value)
+            info = self.owner.device_property_info(name)
+            editable = True if info is None else info[1]
+        node = PropertyNode(name, name.split('.')[-1], parent, editor, editable)
+        parent.add_child(node)
+        self.nodes[name] = node
+        self._add_children(node, value)
+        return node
+
+    def _add_children(self, node: PropertyNode, value):
+        """Create nodes of keys of dictionary value of node"""
+
+        if type(value) not in [dict, ruamel.yaml.comments.CommentedMap]:
+            return
+        widget_type, specs = node.editor
+        for k in value.keys():
+            # dictionary of options holds options of each key
+            child_editor = (widget_type, specs[k]) if widget_type == 'combo' and \
+                type(specs) in [dict, ruamel.yaml.comments.CommentedMap] and k in specs else ('text', None)
+            self._add_node(f'{node.name}.{k}', node, child_editor, node.editable)
+
+    def _remove_children(self, node: PropertyNode):
+        """Forget nodes below node"""
+
+        for child in node.children:
+            self._remove_children(child)
+            del self.nodes[child.name]
+        node.children = []
+
+    def _sync_children(self, node: PropertyNode):
+        """Rebuild rows below node if its dictionary was replaced by one with different keys or by a single value"""
+
+        value = getattr(self.owner, node.name)
+        keys = list(value.keys()) if type(value) in [dict, ruamel.yaml.comments.CommentedMap] else []
+        if [child.name for child in node.children] == [f'{node.name}.{k}' for k in keys]:
+            return
+        parent = self.createIndex(node.row, 0, node)
+        if node.children:
+            self.beginRemoveRows(parent, 0, len(node.children) - 1)
+            self._remove_children(node)
+            self.endRemoveRows()
+        if keys:
+            self.beginInsertRows(parent, 0, len(keys) - 1)
+            self._add_children(node, value)
+            self.endInsertRows()
+
+    def add_property(self, name: str):
+        """Append top level property that wasn't available when model was built
+        :param name: name of property"""
+
+        row = len(self.root.children)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._add_node(name, self.root)
+        self.endInsertRows()
+
+    def set_slider(self, name: str, minimum: float, maximum: float, decimals: int = 0):
+        """Edit numeric property with slider instead of text box
+        :param name: name of property
+        :param minimum: minimum value of slider
+        :param maximum: maximum value of slider
+        :param decimals: decimals slider resolves"""
+
+        self.nodes[name].editor = ('slider', (minimum, maximum, decimals))
+
+    def property_changed(self, name: str):
+        """Notify views that value of property and any nested keys changed. Rows of nested keys are rebuilt if the
+        keys changed
+        :param name: name of property"""
+
+        if (node := self.nodes.get(name)) is None:
+            return
+        self._sync_children(node)
+        index = self.createIndex(node.row, 1, node)
+        self.dataChanged.emit(index, index)
+        if node.children:
+            self.dataChanged.emit(self.createIndex(0, 1, node.children[0]),
+                                  self.createIndex(len(node.children) - 1, 1, node.children[-1]))
+            for child in node.children:
+                if child.children:
+                    self.property_changed(child.name)
+
+    def index(self, row, column, parent=QModelIndex()):
+        parent_node = parent.internalPointer() if parent.isValid() else self.root
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        return self.createIndex(row, column, parent_node.children[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        parent_node = index.internalPointer().parent
+        if parent_node is None or parent_node is self.root:
+            return QModelIndex()
+        return self.createIndex(parent_node.row, 0, parent_node)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() and parent.column() != 0:
+            return 0
+        node = parent.internalPointer() if parent.isValid() else self.root
+        return len(node.children)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.columns[section]
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if index.column() == 0:
+                return ' '.join(word.capitalize() for word in node.key.split('_'))
+            return None if node.children else str(getattr(self.owner, node.name))
+        if role == Qt.ItemDataRole.EditRole and index.column() == 1:
+            return getattr(self.owner, node.name)
+        if role == Qt.ItemDataRole.ToolTipRole and node.parent is self.root:
+            info = self.owner.device_property_info(node.name)
+            return None if info is None else info[0]
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        node = index.internalPointer()
+        if not node.editable:
+            return Qt.ItemFlag.NoItemFlags
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        if index.column() == 1 and not node.children:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.EditRole or index.column() != 1:
+            return False
+        node = index.internalPointer()
+        if node.editor[0] != 'combo':  # combo boxes set text of option like widget backend
+            value_type = type(getattr(self.owner, node.name))
+            try:
+                value = value_type(value)
+            except (TypeError, ValueError):
+                return False
+        self.owner.set_from_widget(node.name, value)
+        self.dataChanged.emit(index, index)
+        self.owner.ValueChangedInside.emit(node.name)
+        return True
+
+
+class QPropertyItemDelegate(QStyledItemDelegate):
+    """Delegate creating text, combo or slider editors only for the row being edited"""
+
+    def createEditor(self, parent, option, index):
+        widget_type, specs = index.internalPointer().editor
+        if widget_type == 'combo':
+            options = specs.keys() if type(specs) in [dict, ruamel.yaml.comments.CommentedMap] else specs
+            editor = QComboBox(parent)
+            editor.addItems([str(x) for x in options])
+            editor.currentTextChanged.connect(lambda: self.commitData.emit(editor))
+        elif widget_type == 'slider':
+            minimum, maximum, decimals = specs
+            editor = QScrollableFloatSlider(decimals, orientation=Qt.Orientation.Horizontal, parent=parent)
+            editor.setMinimum(minimum)
+            editor.setMaximum(maximum)
+            editor.sliderMoved.connect(lambda: self.commitData.emit(editor))
+        else:
+            editor = QScrollableLineEdit(parent)
+            value_type = type(index.data(Qt.ItemDataRole.EditRole))
+            if value_type in (float, int):
+                editor.setValidator(QIntValidator() if value_type == int else QDoubleValidator())
+        return editor
+
+    def setEditorData(self, editor, index):
+        value = index.data(Qt.ItemDataRole.EditRole)
+        editor.blockSignals(True)
+        if isinstance(editor, QComboBox):
+            editor.setCurrentText(str(value))
+        elif isinstance(editor, QScrollableFloatSlider):
+            editor.setValue(value)
+        else:
+            editor.setText(str(value))
+        editor.blockSignals(False)
+
+    def setModelData(self, editor, model, index):
+        if isinstance(editor, QComboBox):
+            model.setData(index, editor.currentText())
+        elif isinstance(editor, QScrollableFloatSlider):
+            model.setData(index, editor.value())
+        else:
+            model.setData(index, editor.text())
@@ -1,8 +1,37 @@
 from qtpy.QtWidgets import QLineEdit
 from qtpy.QtGui import QIntValidator, QDoubleValidator
+from qtpy.QtCore import QTimer
+from time import monotonic
 
 class QScrollableLineEdit(QLineEdit):
     """Widget inheriting from QLineEdit that allows value to be scrollable"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.quiet_period_ms = None
+        self.commit_rate_period_s = None
+        self._last_commit_s = 0.0
+        self._committed_text = None  # text committed by rate limit while scrolling
+        self._commit_timer = None  # created on first set_debounce and reused by later calls
+        self.editingFinished.connect(self._stop_commit_timer)  # enter or focus out commits pending value
+
+    def set_debounce(self, quiet_period_ms: int = None, max_commit_rate_hz: float = None):
+        """Commit scrolled value once scrolling has settled instead of on every wheel step. Intermediate values are
+        still shown
+        :param quiet_period_ms: time without wheel steps before value is committed. None commits every step
+        :param max_commit_rate_hz: if set, also commit while scrolling but no more often than this rate"""
+
+        self.quiet_period_ms = quiet_period_ms
+        if quiet_period_ms is None:
+            self._stop_commit_timer()
+        else:
+            if self._commit_timer is None:
+                self._commit_timer = QTimer(self)
+                self._commit_timer.setSingleShot(True)
+                self._commit_timer.timeout.connect(self._commit_settled)
+            self._commit_timer.setInterval(quiet_period_ms)
+        self.commit_rate_period_s = 1 / max_commit_rate_hz if max_commit_rate_hz else None
+
     def wheelEvent(self, event):
         super().wheelEvent(event)
 
@@ -15,7 +44,27 @@ class QScrollableLineEdit(QLineEdit):
                 new_value = int(self.text())+1 if event.angleDelta().y() > 0 else int(self.text())-1
 
             self.setText(str(new_value))
+            if self.quiet_period_ms is None:
+                self.editingFinished.emit()
+                return
+            if self.commit_rate_period_s is not None and monotonic() - self._last_commit_s >= self.commit_rate_period_s:
+                self.editingFinished.emit()
+                self._last_commit_s = monotonic()
+                self._committed_text = self.text()
+            self._commit_timer.start()  # restart quiet period so settled value is committed
+
+    def _commit_settled(self):
+        """Commit value scrolling settled on unless rate limited commit already sent it"""
+
+        if self.text() != self._committed_text:
             self.editingFinished.emit()
+        self._committed_text = None
+
+    def _stop_commit_timer(self):
+        """Drop pending debounced commit since value was just committed"""
+
+        if self._commit_timer is not None:
+            self._commit_timer.stop()
 
     def value(self):
         """Get float or integer of text"""
@@ -24,5 +73,3 @@ class QScrollableLineEdit(QLineEdit):
     def setValue(self, value):
         """Set number as text"""
         self.setText(str(value))
-
-
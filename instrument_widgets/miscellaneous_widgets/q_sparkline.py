@@ -0,0 +1,74 @@
+from qtpy.QtWidgets import QWidget
+from qtpy.QtCore import QTimer, QPointF, Qt
+from qtpy.QtGui import QPainter, QPolygonF, QPen, QColor
+from weakref import WeakSet
+import numpy
+from instrument_widgets.ring_buffer import RingBuffer
+
+
+class QSparkline(QWidget):
+    """Small line plot of recent history of a value. Appending only marks the sparkline dirty and all dirty
+    sparklines are repainted together on a shared timer so many of them don't compete for the gui thread"""
+
+    repaint_interval_ms = 200
+    _dirty = WeakSet()
+    _repaint_timer = None
+
+    def __init__(self, capacity: int = 120, color: str = '#1f77b4', parent=None):
+        """
+        :param capacity: number of samples shown
+        :param color: color of line"""
+
+        super().__init__(parent)
+        self.history = RingBuffer(capacity)
+        self.pen = QPen(QColor(color))
+        self.setFixedHeight(20)
+        self.setMinimumWidth(60)
+
+    def append(self, value):
+        """Add sample and schedule repaint
+        :param value: numeric value of sample. Values that aren't numbers leave a gap"""
+
+        try:
+            self.history.append(float(value))
+        except (TypeError, ValueError):
+            self.history.append(numpy.nan)
+        QSparkline._dirty.add(self)
+        if QSparkline._repaint_timer is None:  # created on first use since it needs a running application
+            QSparkline._repaint_timer = QTimer()
+            QSparkline._repaint_timer.setSingleShot(True)
+            QSparkline._repaint_timer.timeout.connect(QSparkline.repaint_dirty)
+        if not QSparkline._repaint_timer.isActive():
+            QSparkline._repaint_timer.start(self.repaint_interval_ms)
+
+    @staticmethod
+    def repaint_dirty():
+        """Schedule repaint of every sparkline with new samples. Hidden sparklines are skipped by Qt"""
+
+        dirty = list(QSparkline._dirty)
+        QSparkline._dirty.clear()
+        for sparkline in dirty:
+            sparkline.update()
+
+    def paintEvent(self, event):
+        values = self.history.values()
+        if len(values) < 2 or numpy.isnan(values).all():
+            return
+        minimum, maximum = numpy.nanmin(values), numpy.nanmax(values)
+        span = maximum - minimum if maximum > minimum else 1
+        height = self.height() - 1
+        # fixed horizontal scale so newest sample stays at right edge while history fills
+        x = numpy.linspace(0, self.width() - 1, self.history.capacity)[-len(values):]
+        y = height - (values - minimum) / span * height
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(self.pen)
+        # separate line between each gap so values that aren't numbers aren't drawn
+        finite = ~numpy.isnan(y)
+        edges = numpy.flatnonzero(numpy.diff(numpy.concatenate(([0], finite.astype(int), [0]))))
+        for start, end in zip(edges[::2], edges[1::2]):
+            if end - start > 1:
+                painter.drawPolyline(QPolygonF([QPointF(a, b) for a, b in zip(x[start:end], y[start:end])]))
+            else:
+                painter.drawPoint(QPointF(x[start], y[start]))
+        painter.end()
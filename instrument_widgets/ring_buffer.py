@@ -0,0 +1,44 @@
+import numpy
+
+
+class RingBuffer:
+    """Fixed size history of values in a numpy array. Once full, appending overwrites the oldest value"""
+
+    def __init__(self, capacity: int, dtype=float):
+        """
+        :param capacity: number of values kept
+        :param dtype: numpy type of values"""
+
+        self.data = numpy.zeros(capacity, dtype=dtype)
+        self.capacity = capacity
+        self.index = 0  # position next value is written to
+        self.count = 0
+
+    def append(self, value):
+        """Add value, overwriting oldest value if full
+        :param value: value to add"""
+
+        self.data[self.index] = value
+        self.index = (self.index + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def values(self):
+        """Return array of values from oldest to newest"""
+
+        if self.count < self.capacity:
+            return self.data[:self.count].copy()
+        return numpy.concatenate((self.data[self.index:], self.data[:self.index]))
+
+    def last(self):
+        """Return newest value or None if empty"""
+
+        return self.data[self.index - 1] if self.count else None
+
+    def clear(self):
+        """Remove all values"""
+
+        self.index = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
@@ -0,0 +1,241 @@
+from qtpy.QtCore import QObject, Signal, Slot
+from concurrent.futures import ThreadPoolExecutor, Future
+from threading import Lock, Timer
+import logging
+import json
+import enum
+import sys
+import os
+import numpy
+from instrument_widgets.device_schema import get_device_schema
+from instrument_widgets.device_services.device_locks import get_device_lock
+from instrument_widgets.device_services.device_registry import DeviceRegistry
+from instrument_widgets.device_services.property_poller import values_differ
+
+SNAPSHOT_VERSION = 2  # version 1 files were pickled and are ignored
+
+_restored = DeviceRegistry()  # properties of devices returned by their next scan instead of hardware
+
+
+def widget_properties(widget):
+    """Return dictionary of top level property names of widget mapping to their current values
+    :param widget: BaseDeviceWidget to read properties of"""
+
+    return {name: getattr(widget, name) for name in widget._property_names if '.' not in name}
+
+
+def encode_value(value):
+    """Convert property value to data json can hold. Enums are saved by class and member name and numpy values as
+    python numbers or lists
+    :param value: property value"""
+
+    if isinstance(value, enum.Enum):
+        return {'__enum__': f'{type(value).__module__}:{type(value).__qualname__}', 'name': value.name}
+    if isinstance(value, numpy.ndarray):
+        return {'__ndarray__': value.tolist(), 'dtype': str(value.dtype)}
+    if isinstance(value, numpy.generic):
+        return value.item()
+    if isinstance(value, dict):
+        if not all(isinstance(k, str) for k in value):
+            raise TypeError('dictionary keys must be strings')
+        return {k: encode_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [encode_value(v) for v in value]
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    raise TypeError(f'{type(value).__name__} values are not supported')
+
+
+def decode_value(data):
+    """Convert data written by encode_value back to property value. Enum classes are only looked up in modules that
+    are already imported so a snapshot file never causes code to be imported or run
+    :param data: data read from json"""
+
+    if isinstance(data, dict):
+        if '__enum__' in data:
+            module, qualname = data['__enum__'].split(':')
+            enum_class = sys.modules.get(module)
+            if enum_class is None:
+                raise ValueError(f'module {module} of enum is not imported')
+            for part in qualname.split('.'):
+                enum_class = getattr(enum_class, part)
+            if not (isinstance(enum_class, type) and issubclass(enum_class, enum.Enum)):
+                raise ValueError(f'{data["__enum__"]} is not an enum')
+            return enum_class[data['name']]
+        if '__ndarray__' in data:
+            return numpy.array(data['__ndarray__'], dtype=numpy.dtype(data['dtype']))
+        return {k: decode_value(v) for k, v in data.items()}
+    if isinstance(data, list):
+        return [decode_value(v) for v in data]
+    return data
+
+
+def save_session(path, widgets: dict):
+    """Write properties of every widget to a single json file. Values that can't be converted are left out
+    :param path: path of snapshot file
+    :param widgets: dictionary of device names mapping to BaseDeviceWidgets"""
+
+    log = logging.getLogger(__name__)
+    devices = {}
+    for key, widget in widgets.items():
+        devices[key] = {}
+        for name, value in widget_properties(widget).items():
+            try:
+                devices[key][name] = encode_value(value)
+            except TypeError as e:
+                log.warning(f"{key}.{name} can't be saved: {e}")
+    with open(path, 'w') as file:
+        json.dump({'version': SNAPSHOT_VERSION, 'devices': devices}, file, separators=(',', ':'))
+
+
+def take_restored_properties(device):
+    """Return properties restored for device and forget them so later scans read hardware. None if not restored
+    :param device: device object"""
+
+    return _restored.pop(device)
+
+
+class SessionSnapshot(QObject):
+    """Properties of devices saved by save_session. Restored devices are shown with saved values right away and then
+    reconciled with hardware in the background, reporting any properties that differ. Properties the device has but the
+    snapshot lacks are shown as pending and filled in by reconcile, or read from the device if reconcile isn't started
+    within pending_timeout_s. Snapshots are plain json so loading one never runs code"""
+
+    propertyDiffers = Signal(str, str, object, object)  # device name, property name, saved value, hardware value
+    reconciled = Signal(str, dict)  # device name, dictionary of property names mapping to (saved, hardware) values
+    _hardwareRead = Signal(str, str, object, object)
+    pending_timeout_s = 5  # time after restore that properties missing from snapshot are read without reconcile
+
+    def __init__(self, path, max_workers: int = 4):
+        """
+        :param path: path of snapshot file. Missing or unreadable files give an empty snapshot
+        :param max_workers: number of devices reconciled concurrently"""
+
+        super().__init__()
+        self.log = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.devices = {}
+        self._missing = {}  # device names mapping to futures of properties not in snapshot
+        self._missing_timers = {}  # device names mapping to timers reading missing properties if reconcile is late
+        self._missing_lock = Lock()
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as file:
+                    snapshot = json.load(file)
+                if snapshot.get('version') == SNAPSHOT_VERSION:
+                    self.devices = snapshot['devices']
+                else:
+                    self.log.warning(f'ignoring snapshot {path} of version {snapshot.get("version")}')
+            except (OSError, ValueError, AttributeError) as e:
+                self.log.warning(f'ignoring unreadable snapshot {path}: {e}')
+        self.widgets = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='session_reconcile')
+        self._hardwareRead.connect(self._apply_hardware_value)  # queued since emitted by worker threads
+
+    def properties(self, key: str):
+        """Return saved properties of device. Values whose enum class no longer loads are left out
+        :param key: name device was saved under"""
+
+        properties = {}
+        for name, data in self.devices.get(key, {}).items():
+            try:
+                properties[name] = decode_value(data)
+            except Exception as e:
+                self.log.warning(f"{key}.{name} can't be restored: {e}")
+        return properties
+
+    def restore(self, key: str, device):
+        """Make next scan_for_properties of device return saved properties instead of reading hardware. Properties of
+        device missing from snapshot are returned as pending until reconcile reads them, or until they are read after
+        pending_timeout_s if reconcile isn't started by then. Call before building widget of device
+        :param key: name device was saved under
+        :param device: device object
+        :return: if device was found in snapshot"""
+
+        from instrument_widgets.base_device_widget import PendingProperty  # imported here since it imports this module
+
+        if key not in self.devices:
+            return False
+        properties = self.properties(key)
+        missing = {name: Future() for name in get_device_schema(type(device)).properties if name not in properties}
+        for name, future in missing.items():
+            properties[name] = PendingProperty(future)
+        _restored.set(device, properties)
+        self._take_missing(key)  # stop timer of an earlier restore of device
+        if missing:
+            timer = Timer(self.pending_timeout_s, self._read_missing_late, (key, device))
+            timer.daemon = True
+            with self._missing_lock:
+                self._missing[key] = missing
+                self._missing_timers[key] = timer
+            timer.start()
+        return True
+
+    def reconcile(self, key: str, device, widget):
+        """Read saved properties from hardware in the background and update widget where they differ. Properties
+        missing from snapshot are read too and added to widget
+        :param key: name device was saved under
+        :param device: device object
+        :param widget: BaseDeviceWidget of device built from restored properties
+        :return: future of dictionary of differing property names mapping to (saved, hardware) values"""
+
+        self.widgets[key] = widget
+        saved = {name: value for name, value in self.properties(key).items() if name in widget._property_names}
+        return self._executor.submit(self._reconcile, key, device, saved, self._take_missing(key))
+
+    def _take_missing(self, key):
+        """Return futures of properties missing from snapshot so they are read only once, by reconcile or timer"""
+
+        with self._missing_lock:
+            if (timer := self._missing_timers.pop(key, None)) is not None:
+                timer.cancel()
+            return self._missing.pop(key, {})
+
+    def _read_missing_late(self, key, device):
+        """Read properties missing from snapshot when reconcile wasn't started in time. Runs in timer thread"""
+
+        if missing := self._take_missing(key):
+            self.log.info(f'reading {", ".join(missing)} of {key} since it was not reconciled')
+            self._read_missing(device, missing)
+
+    def _read_missing(self, device, missing):
+        """Read properties missing from snapshot and resolve their futures"""
+
+        lock = get_device_lock(device)
+        for name, future in missing.items():
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                with lock:
+                    value = getattr(device, name)
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result(value)  # widget fills in its placeholder
+
+    def _reconcile(self, key, device, saved, missing):
+        """Compare saved values with hardware and read properties missing from snapshot. Runs in worker thread"""
+
+        self._read_missing(device, missing)
+        lock = get_device_lock(device)
+        diffs = {}
+        for name, value in saved.items():
+            try:
+                with lock:
+                    hardware = getattr(device, name)
+            except Exception as e:
+                self.log.warning(f'reading {key}.{name} failed: {e}')
+                continue
+            if values_differ(hardware, value):
+                diffs[name] = (value, hardware)
+                self._hardwareRead.emit(key, name, value, hardware)
+        if diffs:
+            self.log.info(f'{key} differs from snapshot in {", ".join(diffs)}')
+        self.reconciled.emit(key, diffs)
+        return diffs
+
+    @Slot(str, str, object, object)
+    def _apply_hardware_value(self, key, name, saved, hardware):
+        """Show hardware value in widget and report difference"""
+
+        self.widgets[key].set_from_device(name, hardware)
+        self.propertyDiffers.emit(key, name, saved, hardware)
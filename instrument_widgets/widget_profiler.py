@@ -0,0 +1,103 @@
+from qtpy.QtCore import QObject
+from time import perf_counter
+from itertools import count
+from threading import local
+import functools
+import atexit
+import json
+import os
+from instrument_widgets.device_services.device_registry import DeviceRegistry
+
+PROFILE_ENV_VAR = 'INSTRUMENT_WIDGETS_PROFILE'  # set to 1 to enable or to a path to also export json on exit
+
+
+class WidgetProfiler:
+    """Opt in record of time spent constructing and updating device widgets"""
+
+    def __init__(self, enabled: bool = False):
+        """
+        :param enabled: if calls are recorded"""
+
+        self.enabled = enabled
+        self.records = {}
+        self._keys = DeviceRegistry()  # record key of each owner. Numbered so a reused id starts a new record
+        self._numbers = count()
+
+    def enable(self):
+        """Start recording"""
+
+        self.enabled = True
+
+    def disable(self):
+        """Stop recording"""
+
+        self.enabled = False
+
+    def reset(self):
+        """Remove all records"""
+
+        self.records = {}
+
+    def record(self, owner, section: str, elapsed_s: float, count_objects: bool = False):
+        """Add timing of section to record of owner
+        :param owner: widget or device the section ran for
+        :param section: name of section
+        :param elapsed_s: time section took in seconds
+        :param count_objects: if Qt objects owned by owner are counted"""
+
+        key = self._keys.setdefault(owner, lambda: f'{type(owner).__name__}#{next(self._numbers)}')
+        if key not in self.records:
+            self.records[key] = {'class': type(owner).__name__, 'qt_objects': None, 'sections': {}}
+        record = self.records[key]
+        stats = record['sections'].setdefault(section, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+        elapsed_ms = elapsed_s * 1000
+        stats['count'] += 1
+        stats['total_ms'] += elapsed_ms
+        stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+        if count_objects and isinstance(owner, QObject):
+            record['qt_objects'] = len(owner.findChildren(QObject))
+
+    def to_dict(self):
+        """Return records with mean time of each section added"""
+
+        return {key: {**record, 'sections': {section: {**stats, 'mean_ms': stats['total_ms'] / stats['count']}
+                                             for section, stats in record['sections'].items()}}
+                for key, record in self.records.items()}
+
+    def export_json(self, path):
+        """Write records to json file
+        :param path: path of json file"""
+
+        with open(path, 'w') as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+
+profiler = WidgetProfiler(enabled=os.environ.get(PROFILE_ENV_VAR, '') not in ['', '0'])
+if os.environ.get(PROFILE_ENV_VAR, '') not in ['', '0', '1']:
+    atexit.register(lambda: profiler.export_json(os.environ[PROFILE_ENV_VAR]))
+
+
+def profiled(section: str, count_objects: bool = False):
+    """Decorator recording time of method or function under its first argument. Adds a single check when disabled
+    :param section: name to record time under
+    :param count_objects: if Qt objects owned by first argument are counted afterwards"""
+
+    def decorator(function):
+        running = local()  # sections of owners being timed in each thread so recursive calls count once
+
+        @functools.wraps(function)
+        def wrapper(owner, *args, **kwargs):
+            if not profiler.enabled:
+                return function(owner, *args, **kwargs)
+            active = running.__dict__.setdefault('owners', set())
+            if id(owner) in active:  # nested call is part of outermost call's time
+                return function(owner, *args, **kwargs)
+            active.add(id(owner))
+            start = perf_counter()
+            try:
+                return function(owner, *args, **kwargs)
+            finally:
+                active.discard(id(owner))
+                profiler.record(owner, section, perf_counter() - start, count_objects)
+        return wrapper
+    return decorator
@@ -0,0 +1,108 @@
+"""Round trip between a DeviceAgent and a RemotePanelClient over a local socket. Run from the repository root with:
+python -m pytest tests"""
+
+import os
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import pytest
+import tempfile
+import time
+
+QtWidgets = pytest.importorskip('qtpy.QtWidgets')
+
+from instrument_widgets.base_device_widget import BaseDeviceWidget
+from instrument_widgets.device_services.remote_panel import DeviceAgent, RemotePanelClient
+
+AUTHKEY = b'test'
+
+
+class SimulatedStage:
+    """Device with a flat and a nested property"""
+
+    def __init__(self):
+        self._position_mm = 1.0
+        self._limits_mm = {'x': 10.0, 'y': 20.0}
+
+    @property
+    def position_mm(self):
+        return self._position_mm
+
+    @position_mm.setter
+    def position_mm(self, value):
+        self._position_mm = value
+
+    @property
+    def limits_mm(self):
+        return self._limits_mm
+
+    @limits_mm.setter
+    def limits_mm(self, value):
+        self._limits_mm = value
+
+
+def wait_until(app, condition, timeout_s: float = 5):
+    """Process events until condition is true or timeout passes
+    :return: if condition became true"""
+
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        app.processEvents()
+        if condition():
+            return True
+        time.sleep(.01)
+    return condition()
+
+
+@pytest.fixture
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+@pytest.fixture
+def connection(app):
+    """Agent serving a stage and a client connected to it"""
+
+    stage = SimulatedStage()
+    address = os.path.join(tempfile.mkdtemp(), 'agent')  # short path since unix socket paths are limited in length
+    agent = DeviceAgent(stage, address, rates={'position_mm': 50, 'limits_mm': 50}, flush_interval_ms=10,
+                        authkey=AUTHKEY)
+    agent.start()
+    client = RemotePanelClient(address, AUTHKEY, flush_interval_ms=10)
+    yield stage, agent, client
+    client.close()
+    agent.stop()
+
+
+def test_hello_describes_device(connection):
+    stage, agent, client = connection
+
+    assert client.device_class is SimulatedStage
+    assert client.properties == {'position_mm': 1.0, 'limits_mm': {'x': 10.0, 'y': 20.0}}
+
+
+def test_device_changes_reach_widgets(app, connection):
+    stage, agent, client = connection
+    widgets = [BaseDeviceWidget(client.device_class, client.properties) for _ in range(2)]
+    for widget in widgets:
+        client.connect_widget(widget)
+
+    stage.position_mm = 4.0
+    stage.limits_mm = {'x': 5.0, 'y': 6.0}
+
+    assert wait_until(app, lambda: all(widget.position_mm == 4.0 and widget.limits_mm == {'x': 5.0, 'y': 6.0}
+                                       for widget in widgets))
+    assert widgets[0].limits_mm is not widgets[1].limits_mm  # nested edits in one widget don't leak into the other
+
+
+def test_widget_edits_reach_device(app, connection):
+    stage, agent, client = connection
+    widget = BaseDeviceWidget(client.device_class, client.properties)
+    client.connect_widget(widget)
+
+    widget.set_from_widget('position_mm', 2.5)
+    widget.ValueChangedInside.emit('position_mm')
+    widget.set_from_widget('limits_mm.x', 7.0)
+    widget.ValueChangedInside.emit('limits_mm.x')
+
+    assert wait_until(app, lambda: stage.position_mm == 2.5 and stage.limits_mm == {'x': 7.0, 'y': 20.0})
+    assert stage.limits_mm is not widget.limits_mm